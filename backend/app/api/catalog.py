@@ -38,6 +38,12 @@ _CATALOG_ERROR_DETAILS = {
     CatalogErrorCode.INTERNAL_ERROR: "An internal error occurred.",
 }
 
+# Settings attribute per source. URLs are read at call time so env/settings overrides apply.
+_SOURCE_URL_SETTINGS = {
+    CatalogSourceId.DOCKER: "catalog_docker_url",
+    CatalogSourceId.OFFICIAL: "catalog_official_url",
+}
+
 
 def _resolve_source_id(source: Optional[str]) -> CatalogSourceId:
     """Resolve catalog source ID from query param."""
@@ -54,11 +60,7 @@ def _resolve_source_id(source: Optional[str]) -> CatalogSourceId:
 
 def _resolve_source_url(source_id: CatalogSourceId) -> str:
     """Resolve source ID to upstream catalog URL."""
-    mapping = {
-        CatalogSourceId.DOCKER: settings.catalog_docker_url,
-        CatalogSourceId.OFFICIAL: settings.catalog_official_url,
-    }
-    return mapping[source_id]
+    return getattr(settings, _SOURCE_URL_SETTINGS[source_id])
 
 
 def _catalog_error_response(
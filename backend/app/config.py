@@ -71,7 +71,11 @@ class Settings(BaseSettings):
     )
     catalog_official_page_delay: int = Field(
         default=100,
-        description="ページ間遅延ミリ秒"
+        description="ページ間遅延ミリ秒（前回リクエスト開始からの最小間隔。応答待ち時間も含めて数える）"
+    )
+    catalog_official_fetch_attempts: int = Field(
+        default=2,
+        description="ページ取得の最大試行回数（初回を含む。5xx・通信エラー時にジッター付き指数バックオフで再試行。1 で再試行なし）"
     )
     # GitHub API のレート制限回避用トークン(任意)
     github_token: str = ""
@@ -7,6 +7,7 @@ import hashlib
 import ipaddress
 import json
 import logging
+import random
 import re
 import time
 from email.utils import parsedate_to_datetime
@@ -562,40 +563,108 @@ class CatalogService:
         Raises:
             CatalogError: 初回ページ取得失敗時（部分成功時は警告付きで返却）
         """
-        all_servers: List[dict] = []
+        # 重複除外 (生の server dict の name に基づく) はページ受信ごとに行う。
+        # ページネーションで同じアイテムが重複して返されるケースや、誤って複数回含まれるケースを防ぐ
+        unique_servers: List[dict] = []
+        seen_raw_names: Set[str] = set()
+        seen_hashes: Set[str] = set()  # 名前のないサーバーの重複除外用
+
+        def _is_new_server(server: Any) -> bool:
+            raw_name = None
+            if isinstance(server, dict):
+                # Nested format (registry.modelcontextprotocol.io)
+                if isinstance(server.get("server"), dict):
+                    raw_name = server["server"].get("name")
+                # Flat format
+                else:
+                    raw_name = server.get("name")
+
+            # 名前が特定できる場合は名前ベースで重複チェック
+            if raw_name and isinstance(raw_name, str):
+                if raw_name in seen_raw_names:
+                    return False
+                seen_raw_names.add(raw_name)
+                return True
+
+            # 名前がない場合はコンテンツハッシュで重複チェック
+            # サーバーdict全体をJSON化してハッシュを計算
+            try:
+                server_json = json.dumps(server, sort_keys=True)
+            except (TypeError, ValueError):
+                # JSON化できない場合はスキップ
+                return False
+            content_hash = hashlib.sha256(server_json.encode()).hexdigest()
+            if content_hash in seen_hashes:
+                return False
+            seen_hashes.add(content_hash)
+            return True
+
         cursor: str | None = None
         page_count: int = 0
-        start_time: float = time.time()
 
         max_pages: int = settings.catalog_official_max_pages
         timeout_seconds: int = settings.catalog_official_fetch_timeout
         page_delay_ms: int = settings.catalog_official_page_delay
+        # 壁時計の補正に影響されないよう、経過時間は monotonic な期限で判定する
+        deadline: float = time.monotonic() + timeout_seconds
+        page_delay_seconds: float = page_delay_ms / 1000.0
+        last_request_at: float | None = None
+        fetch_attempts: int = max(1, settings.catalog_official_fetch_attempts)
+        retry_base_delay: float = max(0.1, page_delay_seconds)
 
         try:
+            # カーソルは既存クエリを保ったまま URL エンコードして付与する
+            base_url = httpx.URL(source_url)
+            headers = self._github_headers(source_url)
             async with httpx.AsyncClient(timeout=30.0) as client:
                 while page_count < max_pages:
+                    now = time.monotonic()
                     # タイムアウトチェック
-                    elapsed = time.time() - start_time
-                    if elapsed > timeout_seconds:
+                    if now > deadline:
                         self._append_warning(
                             f"Timeout reached after {page_count} pages. "
-                            f"Returning {len(all_servers)} items."
+                            f"Returning {len(unique_servers)} items."
                         )
                         break
 
+                    # ページ間遅延: 前回リクエスト開始からの経過（応答待ちを含む）を差し引いた残りだけ待つ
+                    if last_request_at is not None:
+                        wait = page_delay_seconds - (now - last_request_at)
+                        if wait > 0:
+                            await asyncio.sleep(wait)
+                            now += wait
+                    last_request_at = now
+
                     # リクエスト URL 構築
-                    url = f"{source_url}?cursor={cursor}" if cursor else source_url
+                    url = (
+                        str(base_url.copy_merge_params({"cursor": cursor}))
+                        if cursor
+                        else source_url
+                    )
 
-                    # ページ取得
+                    # ページ取得(応答待ちも全体の残り時間で打ち切る)
                     try:
-                        response = await client.get(
-                            url,
-                            headers=self._github_headers(source_url)
+                        data = await asyncio.wait_for(
+                            self._get_official_page(
+                                client,
+                                url,
+                                headers,
+                                attempts=fetch_attempts,
+                                base_delay=retry_base_delay,
+                            ),
+                            timeout=max(deadline - now, 0.0),
+                        )
+                    except asyncio.TimeoutError:
+                        if unique_servers:
+                            self._append_warning(
+                                f"Timeout reached while fetching page {page_count + 1}. "
+                                f"Returning {len(unique_servers)} items."
+                            )
+                            break
+                        raise CatalogError(
+                            message="Failed to fetch catalog: timed out",
+                            error_code=CatalogErrorCode.UPSTREAM_UNAVAILABLE
                         )
-                        response.raise_for_status()
-                        # Parse JSON response (AsyncMock compatibility: handle coroutine)
-                        parsed = response.json()
-                        data = await parsed if asyncio.iscoroutine(parsed) else parsed
                     except httpx.HTTPStatusError as e:
                         if e.response.status_code == 429:
                             # レート制限エラー
@@ -608,11 +677,11 @@ class CatalogService:
                                 retry_after_seconds=retry_after
                             )
                         # その他のエラー
-                        if all_servers:
+                        if unique_servers:
                             # 部分成功
                             self._append_warning(
                                 f"Error fetching page {page_count + 1}: {e}. "
-                                f"Returning {len(all_servers)} items."
+                                f"Returning {len(unique_servers)} items."
                             )
                             break
                         else:
@@ -623,10 +692,10 @@ class CatalogService:
                             )
                     except Exception as e:
                         # ネットワークエラー等
-                        if all_servers:
+                        if unique_servers:
                             self._append_warning(
                                 f"Error fetching page {page_count + 1}: {e}. "
-                                f"Returning {len(all_servers)} items."
+                                f"Returning {len(unique_servers)} items."
                             )
                             break
                         else:
@@ -637,12 +706,12 @@ class CatalogService:
 
                     # サーバーリストを結合
                     servers = data.get("servers", [])
-                    all_servers.extend(servers)
+                    unique_servers.extend(filter(_is_new_server, servers))
                     page_count += 1
 
                     logger.info(
                         f"Fetched page {page_count} from Official Registry: "
-                        f"{len(servers)} items (total: {len(all_servers)})"
+                        f"{len(servers)} items (total: {len(unique_servers)})"
                     )
 
                     # 次のカーソルを取得
@@ -653,58 +722,18 @@ class CatalogService:
                         # 最終ページ
                         logger.info(
                             f"Completed pagination: {page_count} pages, "
-                            f"{len(all_servers)} total items"
+                            f"{len(unique_servers)} total items"
                         )
                         break
 
-                    # ページ間遅延
-                    if cursor:
-                        await asyncio.sleep(page_delay_ms / 1000.0)
-
                 # 最大ページ数到達チェック
                 if cursor and page_count >= max_pages:
                     self._append_warning(
                         f"Max pages ({max_pages}) reached. "
-                        f"Returning {len(all_servers)} items. "
+                        f"Returning {len(unique_servers)} items. "
                         f"More items may be available."
                     )
 
-            # 重複除外 (生の server dict の name に基づく)
-            # ページネーションで同じアイテムが重複して返されるケースや、誤って複数回含まれるケースを防ぐ
-            unique_servers: List[dict] = []
-            seen_raw_names: Set[str] = set()
-            seen_hashes: Set[str] = set()  # 名前のないサーバーの重複除外用
-
-            for server in all_servers:
-                raw_name = None
-                if isinstance(server, dict):
-                    # Nested format (registry.modelcontextprotocol.io)
-                    if isinstance(server.get("server"), dict):
-                        raw_name = server["server"].get("name")
-                    # Flat format
-                    else:
-                        raw_name = server.get("name")
-
-                # 名前が特定できる場合は名前ベースで重複チェック
-                if raw_name and isinstance(raw_name, str):
-                    if raw_name in seen_raw_names:
-                        continue
-                    seen_raw_names.add(raw_name)
-                else:
-                    # 名前がない場合はコンテンツハッシュで重複チェック
-                    # サーバーdict全体をJSON化してハッシュを計算
-                    try:
-                        server_json = json.dumps(server, sort_keys=True)
-                        content_hash = hashlib.sha256(server_json.encode()).hexdigest()
-                        if content_hash in seen_hashes:
-                            continue
-                        seen_hashes.add(content_hash)
-                    except (TypeError, ValueError):
-                        # JSON化できない場合はスキップ
-                        continue
-
-                unique_servers.append(server)
-
             # スキーマ変換(重複除外を含む)
             used_ids: Set[str] = set()
             items: List[CatalogItem] = []
@@ -720,12 +749,12 @@ class CatalogService:
             raise
         except Exception as e:
             logger.error(f"Unexpected error in pagination: {e}", exc_info=True)
-            if all_servers:
+            if unique_servers:
                 # 部分成功
                 self._append_warning(f"Unexpected error: {e}. Returning partial data.")
                 used_ids: Set[str] = set()
                 items: List[CatalogItem] = []
-                for server in all_servers:
+                for server in unique_servers:
                     item = self._convert_explore_server(server, used_ids=used_ids)
                     if item is not None:
                         items.append(item)
@@ -736,6 +765,47 @@ class CatalogService:
                     error_code=CatalogErrorCode.INTERNAL_ERROR
                 )
 
+    async def _get_official_page(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        *,
+        attempts: int,
+        base_delay: float,
+    ) -> Any:
+        """
+        Official Registry の 1 ページを取得し、JSON を返す。
+
+        5xx や通信エラーなど一時的な失敗は、初回を含めて最大 attempts 回まで
+        ジッター付き指数バックオフで再試行する。
+        429 は呼び出し側で RATE_LIMITED として扱うため再試行しない。
+        """
+        delay = base_delay
+        for attempt in range(attempts):
+            try:
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                # Parse JSON response (AsyncMock compatibility: handle coroutine)
+                parsed = response.json()
+                return await parsed if asyncio.iscoroutine(parsed) else parsed
+            except Exception as e:
+                if not self._should_retry_official(e) or attempt >= attempts - 1:
+                    raise
+                logger.debug(
+                    f"Retrying Official Registry page fetch: {e} "
+                    f"(attempt {attempt + 2}/{attempts})"
+                )
+                # 複数クライアントの再試行が同時に集中しないよう、待機時間を [delay/2, delay] でばらつかせる
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                delay = min(delay * 2, base_delay * 4)
+
+    def _should_retry_official(self, error: Exception) -> bool:
+        """Official Registry のページ取得をリトライするか判定する(429 は除く)。"""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in {500, 502, 503, 504}
+        return isinstance(error, httpx.RequestError)
+
     def _is_github_contents_payload(self, data: List[Any]) -> bool:
         """
         GitHub Contents API の形式かどうかを判定する。
@@ -7,7 +7,7 @@ import shutil
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from uuid import uuid4
 
 from cryptography import x509
@@ -79,6 +79,7 @@ class SessionService:
         cert_base_dir: Optional[Path] = None,
         signature_verifier: Optional[SignatureVerifier] = None,
         metrics: Optional[MetricsRecorder] = None,
+        mtls_generator: Optional[Callable[[str], Dict[str, str]]] = None,
     ) -> None:
         self.container_service = container_service
         self.state_store = state_store or StateStore()
@@ -87,6 +88,8 @@ class SessionService:
         self._job_tasks: Dict[str, asyncio.Task[None]] = {}
         self.signature_verifier = signature_verifier or NoopSignatureVerifier()
         self.metrics = metrics or MetricsRecorder()
+        # session_id を受け取り bundle_dir/cert_path/key_path/ca_path を返す生成関数
+        self._mtls_generator = mtls_generator or self._ensure_mtls_bundle
 
     async def create_session(
         self,
@@ -170,7 +173,7 @@ class SessionService:
                     if signature_policy.mode != "audit-only":
                         raise
 
-        mtls_bundle = self._ensure_mtls_bundle(session_id)
+        mtls_bundle = self._mtls_generator(session_id)
         config = ContainerConfig(
             name=f"mcp-session-{session_id[:8]}",
             image=image,
@@ -314,6 +317,20 @@ class SessionService:
             output_bytes_limit=output_bytes_limit,
         )
 
+    async def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        バックグラウンドジョブの完了を同じイベントループ上で待機する。
+
+        実行中のタスクが無い（完了済み・未知の job_id）場合は即座に True を返す。
+        timeout 内に完了しなかった場合は False を返す。
+        """
+        task = self._job_tasks.get(job_id)
+        if task is None:
+            return True
+        if not task.done():
+            await asyncio.wait({task}, timeout=timeout)
+        return task.done()
+
     async def get_job_status(self, job_id: str) -> Optional[JobStatus]:
         """ジョブの現在の状態を返す。"""
         record = self.state_store.get_job(job_id)
@@ -321,10 +338,7 @@ class SessionService:
             return None
 
         if record.status == "running" and job_id in self._job_tasks:
-            task = self._job_tasks[job_id]
-            if not task.done():
-                await asyncio.wait({task}, timeout=0.05)
-            if task.done():
+            if await self.wait_for_job(job_id, timeout=0.05):
                 record = self.state_store.get_job(job_id) or record
 
         output: Optional[str] = None
@@ -4,9 +4,13 @@ import os
 import json
 import logging
 import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, NamedTuple, Optional
 from urllib.parse import urlparse
 
 from ..config import settings
@@ -27,6 +31,158 @@ from ..models.state import (
 logger = logging.getLogger(__name__)
 
 
+# 接続ごとに保持するプリペアドステートメント数。save_*/get_* などの SQL がすべて収まる大きさにする
+# （sqlite3 の既定値は 128）。
+_CACHED_STATEMENTS = 256
+
+# 接続ごとに適用する PRAGMA。WAL 前提で commit 時の fsync を減らし、
+# 他接続の書き込み中はエラーにせず一定時間待機する。
+_CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA busy_timeout = 5000;
+"""
+
+# init_schema で一括実行する DDL。executescript で 1 回の呼び出しにまとめて適用する。
+# gc_expired の期限判定に使う列には索引を張り、削除を範囲検索で済ませる
+# （時刻は _to_iso で UTC の ISO8601 に揃えているため文字列比較で大小が決まる）。
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS credentials (
+    credential_key TEXT PRIMARY KEY,
+    token_ref TEXT NOT NULL,
+    scopes TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    server_id TEXT NOT NULL,
+    oauth_token_url TEXT,
+    oauth_client_id TEXT,
+    created_by TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_credentials_expires_at
+    ON credentials(expires_at);
+CREATE TABLE IF NOT EXISTS remote_servers (
+    server_id TEXT PRIMARY KEY,
+    catalog_item_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    credential_key TEXT REFERENCES credentials(credential_key) ON DELETE SET NULL,
+    last_connected_at TEXT,
+    error_message TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_remote_servers_catalog_item_id
+    ON remote_servers(catalog_item_id);
+CREATE TABLE IF NOT EXISTS oauth_states (
+    state TEXT PRIMARY KEY,
+    server_id TEXT NOT NULL,
+    code_challenge TEXT,
+    code_challenge_method TEXT,
+    scopes TEXT NOT NULL,
+    authorize_url TEXT NOT NULL,
+    token_url TEXT NOT NULL,
+    client_id TEXT NOT NULL,
+    redirect_uri TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_oauth_states_expires_at
+    ON oauth_states(expires_at);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    server_id TEXT NOT NULL,
+    config TEXT NOT NULL,
+    state TEXT NOT NULL,
+    idle_deadline TEXT NOT NULL,
+    gateway_endpoint TEXT NOT NULL,
+    metrics_endpoint TEXT NOT NULL,
+    mtls_cert_ref TEXT,
+    feature_flags TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_idle_deadline
+    ON sessions(idle_deadline);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    queued_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    exit_code INTEGER,
+    timeout INTEGER NOT NULL,
+    truncated INTEGER NOT NULL,
+    output_ref TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_gc_at
+    ON jobs(COALESCE(finished_at, queued_at));
+CREATE TABLE IF NOT EXISTS signature_policies (
+    server_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS gateway_allowlist (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_by TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    enabled INTEGER NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    action TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    target TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS github_tokens (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    token_ref TEXT NOT NULL,
+    source TEXT NOT NULL,
+    updated_by TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS auth_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    bw_session_key TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    last_activity TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_auth_sessions_expires_at
+    ON auth_sessions(expires_at);
+CREATE TABLE IF NOT EXISTS container_configs (
+    container_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    image TEXT NOT NULL,
+    config TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# 適用済みスキーマの識別子。PRAGMA user_version に記録し、一致すれば init_schema の DDL と
+# マイグレーションを省略する。DDL を変更すると値が変わり、次回起動時に 1 度だけ再適用される
+# （user_version は符号付き 32bit で新規 DB は 0 のため、1 以上の正の値に収める）。
+_SCHEMA_VERSION = (zlib.crc32(_SCHEMA_SQL.encode("utf-8")) & 0x7FFFFFFF) or 1
+
+
+# gc_expired が実行する削除文。各文は期限の境界時刻を 1 つだけ受け取る。
+_GC_STATEMENTS: tuple[tuple[str, str], ...] = (
+    ("credentials", "DELETE FROM credentials WHERE expires_at < ?"),
+    ("sessions", "DELETE FROM sessions WHERE idle_deadline < ?"),
+    ("jobs", "DELETE FROM jobs WHERE COALESCE(finished_at, queued_at) < ?"),
+    ("auth_sessions", "DELETE FROM auth_sessions WHERE expires_at < ?"),
+    ("oauth_states", "DELETE FROM oauth_states WHERE expires_at < ?"),
+)
+
+
 def _to_iso(dt: datetime) -> str:
     """datetime を ISO8601 文字列に変換する。"""
     if dt.tzinfo is None:
@@ -39,141 +195,143 @@ def _from_iso(value: str) -> datetime:
     return datetime.fromisoformat(value)
 
 
+_REDACTED = "***redacted***"
+# キー名にこれらの語を含むメタデータは監査ログへ記録する前にマスクする
+_SENSITIVE_KEY_MARKERS: tuple[str, ...] = ("token", "credential", "secret")
+
+
+@lru_cache(maxsize=256)
+def _is_sensitive_key(key: str) -> bool:
+    """メタデータのキーが秘密情報を示すかを判定する。監査ログのキーは種類が少ないため結果をキャッシュする。"""
+    lowered = key.lower()
+    return any(marker in lowered for marker in _SENSITIVE_KEY_MARKERS)
+
+
+class _Allowlist(NamedTuple):
+    """
+    REMOTE_MCP_ALLOWED_DOMAINS を照合用に分解した結果。
+
+    要素は (ホスト, ポート) の組で、ポート指定が無いエントリは None（スキームの標準ポートのみ許可）。
+    wildcard には "*.example.com" の "example.com" 部分を保持する。
+    """
+
+    exact: frozenset[tuple[str, Optional[int]]]
+    wildcard: frozenset[tuple[str, Optional[int]]]
+
+
+@lru_cache(maxsize=16)
+def _compile_allowlist(raw_allowlist: str) -> _Allowlist:
+    """
+    許可リスト文字列を集合に分解する。ポートが数値でない、または 1-65535 の範囲外のエントリは無視する。
+
+    照合はホストのラベル数に比例する回数の集合検索で済み、エントリ数に依存しない。
+    環境変数の値ごとに結果をキャッシュする。
+    """
+    exact: set[tuple[str, Optional[int]]] = set()
+    wildcard: set[tuple[str, Optional[int]]] = set()
+    for raw_entry in raw_allowlist.split(","):
+        entry = raw_entry.strip().lower()
+        if not entry:
+            continue
+        entry_host, entry_port = entry, None
+        if ":" in entry:
+            entry_host, entry_port_str = entry.rsplit(":", 1)
+            try:
+                entry_port = int(entry_port_str)
+            except ValueError:
+                continue
+            # ポート 0 や範囲外の値は無効なエントリとして無視する（標準ポートへ読み替えない）
+            if not 0 < entry_port <= 65535:
+                continue
+        if entry_host.startswith("*."):
+            wildcard.add((entry_host[2:], entry_port))
+        else:
+            exact.add((entry_host, entry_port))
+    return _Allowlist(frozenset(exact), frozenset(wildcard))
+
+
 class StateStore:
     """永続化ストアのファサード。"""
 
     def __init__(self, db_path: Optional[str] = None) -> None:
         self.db_path = db_path or settings.state_db_path
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # "file:" で始まるパスは SQLite の URI として扱う（共有キャッシュのインメモリ DB など）
+        self._is_uri = self.db_path.startswith("file:")
+        if not self._is_uri:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._initialized = False
+        # 接続はスレッドごとに 1 本だけ開いて使い回す（sqlite3 の接続はスレッド間で共有しない）
+        self._local = threading.local()
 
     def _connect(self) -> sqlite3.Connection:
-        """SQLite 接続を取得する。"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
+        """
+        現在のスレッド用の SQLite 接続を取得する。
+
+        初回のみ接続を開き、以降は同じ接続を返す。接続は autocommit（isolation_level=None）で開くため、
+        複数の文をまとめて書き込む場合は `_transaction()` で明示的にトランザクションを張る。
+        """
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                uri=self._is_uri,
+                cached_statements=_CACHED_STATEMENTS,
+                isolation_level=None,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(_CONNECTION_PRAGMAS)
+            self._local.conn = conn
         return conn
 
+    @contextmanager
+    def _transaction(self, *, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        明示的な BEGIN/COMMIT で囲んだ接続を返す。例外時は ROLLBACK する。
+
+        Args:
+            immediate: True の場合は BEGIN IMMEDIATE で書き込みロックを最初に確保する。
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            # COMMIT 自体が失敗した場合も含め、開いたままのトランザクションを残さない
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """現在のスレッドで開いている接続を閉じる。閉じる前にクエリプランナーの統計を更新する。"""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error as exc:
+                logger.debug("PRAGMA optimize failed; closing anyway: %s", exc)
+            conn.close()
+            self._local.conn = None
+
     def init_schema(self) -> None:
-        """必要なテーブルを作成する。既に存在する場合は何もしない。"""
+        """必要なテーブルを作成する。同じスキーマを適用済みの DB では何もしない。"""
         if self._initialized:
             return
-        with self._connect() as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS credentials (
-                    credential_key TEXT PRIMARY KEY,
-                    token_ref TEXT NOT NULL,
-                    scopes TEXT NOT NULL,
-                    expires_at TEXT NOT NULL,
-                    server_id TEXT NOT NULL,
-                    oauth_token_url TEXT,
-                    oauth_client_id TEXT,
-                    created_by TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS remote_servers (
-                    server_id TEXT PRIMARY KEY,
-                    catalog_item_id TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    endpoint TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    credential_key TEXT REFERENCES credentials(credential_key) ON DELETE SET NULL,
-                    last_connected_at TEXT,
-                    error_message TEXT,
-                    created_at TEXT NOT NULL
-                );
-                CREATE INDEX IF NOT EXISTS idx_remote_servers_catalog_item_id
-                    ON remote_servers(catalog_item_id);
-                CREATE TABLE IF NOT EXISTS oauth_states (
-                    state TEXT PRIMARY KEY,
-                    server_id TEXT NOT NULL,
-                    code_challenge TEXT,
-                    code_challenge_method TEXT,
-                    scopes TEXT NOT NULL,
-                    authorize_url TEXT NOT NULL,
-                    token_url TEXT NOT NULL,
-                    client_id TEXT NOT NULL,
-                    redirect_uri TEXT NOT NULL,
-                    expires_at TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE INDEX IF NOT EXISTS idx_oauth_states_expires_at
-                    ON oauth_states(expires_at);
-                CREATE TABLE IF NOT EXISTS sessions (
-                    session_id TEXT PRIMARY KEY,
-                    server_id TEXT NOT NULL,
-                    config TEXT NOT NULL,
-                    state TEXT NOT NULL,
-                    idle_deadline TEXT NOT NULL,
-                    gateway_endpoint TEXT NOT NULL,
-                    metrics_endpoint TEXT NOT NULL,
-                    mtls_cert_ref TEXT,
-                    feature_flags TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS jobs (
-                    job_id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    queued_at TEXT NOT NULL,
-                    started_at TEXT,
-                    finished_at TEXT,
-                    exit_code INTEGER,
-                    timeout INTEGER NOT NULL,
-                    truncated INTEGER NOT NULL,
-                    output_ref TEXT,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS signature_policies (
-                    server_id TEXT PRIMARY KEY,
-                    payload TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS gateway_allowlist (
-                    id TEXT PRIMARY KEY,
-                    type TEXT NOT NULL,
-                    value TEXT NOT NULL,
-                    created_by TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    enabled INTEGER NOT NULL,
-                    version INTEGER NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS audit_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    category TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    actor TEXT NOT NULL,
-                    target TEXT NOT NULL,
-                    metadata TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS github_tokens (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    token_ref TEXT NOT NULL,
-                    source TEXT NOT NULL,
-                    updated_by TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS auth_sessions (
-                    session_id TEXT PRIMARY KEY,
-                    user_email TEXT NOT NULL,
-                    bw_session_key TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    expires_at TEXT NOT NULL,
-                    last_activity TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS container_configs (
-                    container_id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    image TEXT NOT NULL,
-                    config TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                """
-            )
+        conn = self._connect()
+        # 削除で空いたページを incremental_vacuum で回収できるようにする。
+        # DB ヘッダが書かれる前（journal_mode の変更より前）の新規 DB にのみ効き、
+        # 既存 DB では何も変わらない
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        # journal_mode は DB ファイルに永続化されるため初期化時に 1 度だけ設定する
+        # （インメモリ DB では memory のまま変わらない）
+        conn.execute("PRAGMA journal_mode = WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION:
+            self._initialized = True
+            return
+        conn.executescript(_SCHEMA_SQL)
+        with self._transaction() as conn:
             self._migrate_columns(conn)
-            conn.commit()
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         self._initialized = True
 
     def _migrate_columns(self, conn: sqlite3.Connection) -> None:
@@ -294,16 +452,16 @@ class StateStore:
 
     def list_tables(self) -> List[str]:
         """テーブル一覧を返す（テスト用ヘルパー）。"""
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
-            ).fetchall()
-            return [row["name"] for row in rows]
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ).fetchall()
+        return [row["name"] for row in rows]
 
     # Credential operations
     def save_credential(self, record: CredentialRecord) -> None:
         """資格情報レコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO credentials (
@@ -323,15 +481,14 @@ class StateStore:
                     _to_iso(record.created_at),
                 ),
             )
-            conn.commit()
 
     def get_credential(self, credential_key: str) -> Optional[CredentialRecord]:
         """資格情報レコードを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM credentials WHERE credential_key=?",
-                (credential_key,),
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM credentials WHERE credential_key=?",
+            (credential_key,),
+        ).fetchone()
         if row is None:
             return None
         return CredentialRecord(
@@ -348,8 +505,8 @@ class StateStore:
 
     def list_credentials(self) -> List[CredentialRecord]:
         """資格情報レコードを全件取得する。"""
-        with self._connect() as conn:
-            rows = conn.execute("SELECT * FROM credentials").fetchall()
+        conn = self._connect()
+        rows = conn.execute("SELECT * FROM credentials").fetchall()
         return [
             CredentialRecord(
                 credential_key=row["credential_key"],
@@ -367,17 +524,16 @@ class StateStore:
 
     def delete_credential(self, credential_key: str) -> None:
         """資格情報レコードを削除する。存在しない場合は何もしない。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 "DELETE FROM credentials WHERE credential_key=?",
                 (credential_key,),
             )
-            conn.commit()
 
     # Remote server operations
     def save_remote_server(self, record: RemoteServerRecord) -> None:
         """リモートサーバーレコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO remote_servers (
@@ -397,15 +553,14 @@ class StateStore:
                     _to_iso(record.created_at),
                 ),
             )
-            conn.commit()
 
     def get_remote_server(self, server_id: str) -> Optional[RemoteServerRecord]:
         """リモートサーバーレコードを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM remote_servers WHERE server_id=?",
-                (server_id,),
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM remote_servers WHERE server_id=?",
+            (server_id,),
+        ).fetchone()
         if row is None:
             return None
         return RemoteServerRecord(
@@ -422,8 +577,8 @@ class StateStore:
 
     def list_remote_servers(self) -> List[RemoteServerRecord]:
         """リモートサーバーレコードを全件取得する。"""
-        with self._connect() as conn:
-            rows = conn.execute("SELECT * FROM remote_servers").fetchall()
+        conn = self._connect()
+        rows = conn.execute("SELECT * FROM remote_servers").fetchall()
         records: List[RemoteServerRecord] = []
         for row in rows:
             records.append(
@@ -443,14 +598,13 @@ class StateStore:
 
     def delete_remote_server(self, server_id: str) -> None:
         """リモートサーバーレコードを削除する。存在しない場合は何もしない。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute("DELETE FROM remote_servers WHERE server_id=?", (server_id,))
-            conn.commit()
 
     # OAuth state operations
     def save_oauth_state(self, record: OAuthStateRecord) -> None:
         """OAuth state レコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO oauth_states (
@@ -472,15 +626,14 @@ class StateStore:
                     _to_iso(record.created_at),
                 ),
             )
-            conn.commit()
 
     def get_oauth_state(self, state: str) -> Optional[OAuthStateRecord]:
         """OAuth state レコードを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM oauth_states WHERE state=?",
-                (state,),
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM oauth_states WHERE state=?",
+            (state,),
+        ).fetchone()
 
         if row is None:
             return None
@@ -500,17 +653,16 @@ class StateStore:
 
     def delete_oauth_state(self, state: str) -> None:
         """OAuth state レコードを削除する。存在しない場合は何もしない。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 "DELETE FROM oauth_states WHERE state=?",
                 (state,),
             )
-            conn.commit()
 
     # Container config operations
     def save_container_config(self, record: ContainerConfigRecord) -> None:
         """コンテナ設定レコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO container_configs (
@@ -525,15 +677,14 @@ class StateStore:
                     _to_iso(record.created_at),
                 ),
             )
-            conn.commit()
 
     def get_container_config(self, container_id: str) -> Optional[ContainerConfigRecord]:
         """コンテナ設定レコードを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM container_configs WHERE container_id=?",
-                (container_id,),
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM container_configs WHERE container_id=?",
+            (container_id,),
+        ).fetchone()
         if row is None:
             return None
         return ContainerConfigRecord(
@@ -547,7 +698,7 @@ class StateStore:
     # GitHub token operations
     def save_github_token(self, record: GitHubTokenRecord) -> None:
         """GitHub トークンレコードを保存する（単一行）。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO github_tokens (id, token_ref, source, updated_by, updated_at)
@@ -565,12 +716,11 @@ class StateStore:
                     _to_iso(record.updated_at),
                 ),
             )
-            conn.commit()
 
     def get_github_token(self) -> Optional[GitHubTokenRecord]:
         """GitHub トークンレコードを取得する。存在しない場合は None。"""
-        with self._connect() as conn:
-            row = conn.execute("SELECT * FROM github_tokens WHERE id=1").fetchone()
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM github_tokens WHERE id=1").fetchone()
         if row is None:
             return None
         return GitHubTokenRecord(
@@ -582,14 +732,13 @@ class StateStore:
 
     def delete_github_token(self) -> None:
         """GitHub トークンレコードを削除する。存在しない場合は何もしない。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute("DELETE FROM github_tokens WHERE id=1")
-            conn.commit()
 
     # Auth session operations
     def save_auth_session(self, record: AuthSessionRecord) -> None:
         """ログインセッションレコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO auth_sessions (
@@ -606,14 +755,13 @@ class StateStore:
                     _to_iso(record.last_activity),
                 ),
             )
-            conn.commit()
 
     def get_auth_session(self, session_id: str) -> Optional[AuthSessionRecord]:
         """ログインセッションレコードを取得する。存在しない場合は None。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM auth_sessions WHERE session_id=?", (session_id,)
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM auth_sessions WHERE session_id=?", (session_id,)
+        ).fetchone()
         if row is None:
             return None
         return AuthSessionRecord(
@@ -627,8 +775,8 @@ class StateStore:
 
     def list_auth_sessions(self) -> List[AuthSessionRecord]:
         """全ログインセッションレコードを取得する。"""
-        with self._connect() as conn:
-            rows = conn.execute("SELECT * FROM auth_sessions").fetchall()
+        conn = self._connect()
+        rows = conn.execute("SELECT * FROM auth_sessions").fetchall()
         sessions: List[AuthSessionRecord] = []
         for row in rows:
             sessions.append(
@@ -645,14 +793,13 @@ class StateStore:
 
     def delete_auth_session(self, session_id: str) -> None:
         """ログインセッションレコードを削除する。存在しない場合は何もしない。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute("DELETE FROM auth_sessions WHERE session_id=?", (session_id,))
-            conn.commit()
 
     # Session operations
     def save_session(self, record: SessionRecord) -> None:
         """セッションレコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO sessions (
@@ -674,14 +821,13 @@ class StateStore:
                     _to_iso(record.created_at),
                 ),
             )
-            conn.commit()
 
     def get_session(self, session_id: str) -> Optional[SessionRecord]:
         """セッションレコードを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM sessions WHERE session_id=?", (session_id,)
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM sessions WHERE session_id=?", (session_id,)
+        ).fetchone()
         if row is None:
             return None
         return SessionRecord(
@@ -701,14 +847,13 @@ class StateStore:
 
     def delete_session(self, session_id: str) -> None:
         """セッションレコードを削除する。存在しない場合は何もしない。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute("DELETE FROM sessions WHERE session_id=?", (session_id,))
-            conn.commit()
 
     # Job operations
     def save_job(self, record: JobRecord) -> None:
         """ジョブレコードを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO jobs (
@@ -730,12 +875,11 @@ class StateStore:
                     _to_iso(record.created_at),
                 ),
             )
-            conn.commit()
 
     def get_job(self, job_id: str) -> Optional[JobRecord]:
         """ジョブレコードを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute("SELECT * FROM jobs WHERE job_id=?", (job_id,)).fetchone()
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE job_id=?", (job_id,)).fetchone()
         if row is None:
             return None
         return JobRecord(
@@ -755,7 +899,7 @@ class StateStore:
     # Signature policy operations
     def save_signature_policy(self, record: SignaturePolicyRecord) -> None:
         """署名ポリシーを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO signature_policies (
@@ -768,14 +912,13 @@ class StateStore:
                     _to_iso(record.updated_at),
                 ),
             )
-            conn.commit()
 
     def get_signature_policy(self, server_id: str) -> Optional[SignaturePolicyRecord]:
         """署名ポリシーを取得する。"""
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM signature_policies WHERE server_id=?", (server_id,)
-            ).fetchone()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT * FROM signature_policies WHERE server_id=?", (server_id,)
+        ).fetchone()
         if row is None:
             return None
         return SignaturePolicyRecord(
@@ -787,7 +930,7 @@ class StateStore:
     # Gateway allowlist operations
     def save_gateway_allow_entry(self, record: GatewayAllowEntry) -> None:
         """外部ゲートウェイ許可リストを保存する。"""
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO gateway_allowlist (
@@ -804,12 +947,11 @@ class StateStore:
                     record.version,
                 ),
             )
-            conn.commit()
 
     def list_gateway_allow_entries(self) -> List[GatewayAllowEntry]:
         """許可リストを全件取得する。"""
-        with self._connect() as conn:
-            rows = conn.execute("SELECT * FROM gateway_allowlist").fetchall()
+        conn = self._connect()
+        rows = conn.execute("SELECT * FROM gateway_allowlist").fetchall()
         entries: List[GatewayAllowEntry] = []
         for row in rows:
             entries.append(
@@ -838,7 +980,7 @@ class StateStore:
         """監査ログを保存する。"""
         sanitized = self._sanitize_metadata(metadata)
         timestamp = created_at or datetime.now(timezone.utc)
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO audit_logs (category, action, actor, target, metadata, created_at)
@@ -853,14 +995,16 @@ class StateStore:
                     _to_iso(timestamp),
                 ),
             )
-            conn.commit()
 
-    def is_endpoint_allowed(self, url: str) -> bool:
+    def is_endpoint_allowed(self, url: str, *, allowlist: Optional[str] = None) -> bool:
         """
         REMOTE_MCP_ALLOWED_DOMAINS に基づきエンドポイント URL を検証する。
 
+        allowlist を指定した場合は環境変数の代わりにその値（カンマ区切り）を使う。
         空リストは deny-all とし、IPv6 リテラルはセキュリティ理由で拒否する。
         """
+        if allowlist is None:
+            allowlist = os.getenv("REMOTE_MCP_ALLOWED_DOMAINS", "")
         parsed = urlparse(url)
         host = (parsed.hostname or "").lower()
         if not host:
@@ -871,43 +1015,38 @@ class StateStore:
         scheme = (parsed.scheme or "").lower()
         port = parsed.port or (443 if scheme == "https" else 80)
 
-        raw_allowlist = os.getenv("REMOTE_MCP_ALLOWED_DOMAINS", "")
-        allowlist = [entry.strip().lower() for entry in raw_allowlist.split(",") if entry.strip()]
-        if not allowlist:
+        compiled = _compile_allowlist(allowlist)
+        if not compiled.exact and not compiled.wildcard:
             return False
 
-        for entry in allowlist:
-            entry_host = entry
-            entry_port = None
-            if ":" in entry:
-                entry_host, entry_port_str = entry.rsplit(":", 1)
-                try:
-                    entry_port = int(entry_port_str)
-                except ValueError:
-                    continue
-            else:
-                entry_port = 443 if scheme == "https" else 80
-
-            if entry_host.startswith("*."):
-                suffix = entry_host[2:]
-                if host.endswith("." + suffix) and entry_port == port:
-                    return True
-            elif host == entry_host and entry_port == port:
+        # ポート指定なしのエントリはスキームの標準ポートにのみマッチする
+        ports: tuple[Optional[int], ...] = (port,)
+        if port == (443 if scheme == "https" else 80):
+            ports = (port, None)
+
+        if any((host, candidate) in compiled.exact for candidate in ports):
+            return True
+
+        # ワイルドカードはサブドメインのみ対象とするため、先頭ラベルを 1 つ以上除いた親ドメインで照合する
+        labels = host.split(".")
+        for index in range(1, len(labels)):
+            parent = ".".join(labels[index:])
+            if any((parent, candidate) in compiled.wildcard for candidate in ports):
                 return True
 
         return False
 
     def get_recent_audit_logs(self, limit: int = 20) -> List[AuditLogEntry]:
         """最近の監査ログを取得する。"""
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM audit_logs
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
+        conn = self._connect()
+        rows = conn.execute(
+            """
+            SELECT * FROM audit_logs
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
         result: List[AuditLogEntry] = []
         for row in rows:
             result.append(
@@ -932,62 +1071,28 @@ class StateStore:
             削除件数のディクショナリ。
         """
         now = now or datetime.now(timezone.utc)
-        credential_cutoff = now - timedelta(days=settings.credential_retention_days)
-        job_cutoff = now - timedelta(hours=settings.job_retention_hours)
-        session_cutoff = now
-
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "DELETE FROM credentials WHERE expires_at < ?",
-                (_to_iso(credential_cutoff),),
-            )
-            cred_deleted = cur.rowcount
-
-            cur.execute(
-                "DELETE FROM sessions WHERE idle_deadline < ?",
-                (_to_iso(session_cutoff),),
-            )
-            session_deleted = cur.rowcount
-
-            cur.execute(
-                """
-                DELETE FROM jobs
-                WHERE COALESCE(finished_at, queued_at) < ?
-                """,
-                (_to_iso(job_cutoff),),
-            )
-            job_deleted = cur.rowcount
-
-            cur.execute(
-                "DELETE FROM auth_sessions WHERE expires_at < ?",
-                (_to_iso(now),),
-            )
-            auth_session_deleted = cur.rowcount
-
-            cur.execute(
-                "DELETE FROM oauth_states WHERE expires_at < ?",
-                (_to_iso(now),),
-            )
-            oauth_state_deleted = cur.rowcount
-
-            conn.commit()
-
-        return {
-            "credentials": cred_deleted,
-            "sessions": session_deleted,
-            "jobs": job_deleted,
-            "auth_sessions": auth_session_deleted,
-            "oauth_states": oauth_state_deleted,
+        cutoffs = {
+            "credentials": now - timedelta(days=settings.credential_retention_days),
+            "sessions": now,
+            "jobs": now - timedelta(hours=settings.job_retention_hours),
+            "auth_sessions": now,
+            "oauth_states": now,
         }
 
+        removed: Dict[str, int] = {}
+        # 全テーブルの削除を 1 トランザクションにまとめ、書き込みロックを最初に確保する
+        with self._transaction(immediate=True) as conn:
+            for table, statement in _GC_STATEMENTS:
+                removed[table] = conn.execute(statement, (_to_iso(cutoffs[table]),)).rowcount
+        if any(removed.values()):
+            # 削除で空いたページをファイルから切り詰める（auto_vacuum=INCREMENTAL の DB のみ有効）。
+            # execute() では 1 ステップ（1 ページ）しか進まないため executescript で最後まで実行する
+            conn.executescript("PRAGMA incremental_vacuum;")
+        return removed
+
     def _sanitize_metadata(self, metadata: Dict[str, object]) -> Dict[str, object]:
         """秘密情報を含むキーをマスクする。"""
-        sanitized: Dict[str, object] = {}
-        for key, value in metadata.items():
-            lowered = key.lower()
-            if any(token in lowered for token in ["token", "credential", "secret"]):
-                sanitized[key] = "***redacted***"
-            else:
-                sanitized[key] = value
-        return sanitized
+        return {
+            key: _REDACTED if _is_sensitive_key(key) else value
+            for key, value in metadata.items()
+        }
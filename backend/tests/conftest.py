@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import os
+import sqlite3
 import stat
+import uuid
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Iterator
 from unittest.mock import MagicMock, patch
 
@@ -210,6 +215,53 @@ def _mock_docker_socket(tmp_path_factory: pytest.TempPathFactory) -> Iterator[No
         app_config.settings.docker_host = previous_setting
 
 
+@pytest.fixture
+def fixed_now() -> datetime:
+    """テスト内で基準にする固定の現在時刻を返す。"""
+    return datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="session")
+def state_store_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    スキーマ初期化済みの SQLite ファイルをセッション内で 1 度だけ作成する。
+    DDL とマイグレーションの実行はここに集約し、各テストはこのファイルを複製して使う。
+    """
+    template_path = tmp_path_factory.mktemp("state-store") / "template.db"
+    StateStore(str(template_path)).init_schema()
+    return template_path
+
+
+@pytest.fixture
+def state_store_factory(state_store_template: Path):
+    """
+    テンプレート DB を共有キャッシュのインメモリ DB に複製した StateStore を返すファクトリ。
+    ジャーナルやファイル I/O を伴わず、テストごとに別 DB を払い出すため状態は共有されない。
+    """
+    anchors: list[sqlite3.Connection] = []
+    stores: list[StateStore] = []
+
+    def _factory() -> StateStore:
+        uri = f"file:state-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        # 共有キャッシュのインメモリ DB は最後の接続が閉じると破棄されるため、
+        # テスト終了まで保持する接続にテンプレートを複製しておく
+        anchor = sqlite3.connect(uri, uri=True)
+        with closing(sqlite3.connect(state_store_template)) as template:
+            template.backup(anchor)
+        anchors.append(anchor)
+        store = StateStore(uri)
+        # スキーマはテンプレート作成時に適用済みのため再実行しない
+        store._initialized = True  # type: ignore[attr-defined]
+        stores.append(store)
+        return store
+
+    yield _factory
+    for store in stores:
+        store.close()
+    for anchor in anchors:
+        anchor.close()
+
+
 @pytest.fixture(autouse=True)
 def clear_auth_sessions() -> None:
     """各テスト間で認証セッションの永続データをクリーンに保つ。"""
@@ -223,13 +275,13 @@ def clear_auth_sessions() -> None:
     store = StateStore()
     store.init_schema()
     try:
-        with store._connect() as conn:  # type: ignore[attr-defined]
+        with store._transaction() as conn:  # type: ignore[attr-defined]
             conn.execute("DELETE FROM auth_sessions")
-            conn.commit()
     except Exception:
         # DB がまだ初期化されていない場合などはスキップ
         return
     finally:
+        store.close()
         try:
             from app.services import auth as auth_service  # pylint: disable=import-outside-toplevel
 
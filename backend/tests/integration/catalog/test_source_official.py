@@ -488,9 +488,12 @@ async def test_get_catalog_official_pagination_page_delay():
     with patch("app.api.catalog.catalog_service.get_cached_catalog") as mock_get_cache, \
          patch("httpx.AsyncClient") as mock_client_class, \
          patch("asyncio.sleep") as mock_sleep, \
+         patch("app.services.catalog.time") as mock_time, \
          patch("app.config.settings.catalog_official_page_delay", 500):  # 500ms delay
 
         mock_get_cache.return_value = None
+        # Freeze the pagination clock so response time is not deducted from the delay
+        mock_time.monotonic.return_value = 0
 
         # Create 3 pages of responses
         page1_response = AsyncMock()
@@ -554,7 +557,8 @@ async def test_get_catalog_official_pagination_partial_failure():
         }
 
     with patch("app.api.catalog.catalog_service.get_cached_catalog") as mock_get_cache, \
-         patch("httpx.AsyncClient") as mock_client_class:
+         patch("httpx.AsyncClient") as mock_client_class, \
+         patch("app.config.settings.catalog_official_fetch_attempts", 1):  # 再試行なし
 
         mock_get_cache.return_value = None
 
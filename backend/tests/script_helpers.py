@@ -0,0 +1,25 @@
+"""Shared helpers for tests that run the repository's shell scripts in a subprocess."""
+
+from __future__ import annotations
+
+import stat
+import subprocess
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def failure_message(result: subprocess.CompletedProcess[bytes]) -> str:
+    # Output is captured as bytes and only decoded when a test is about to fail.
+    stdout = result.stdout.decode("utf-8", errors="replace")
+    stderr = result.stderr.decode("utf-8", errors="replace")
+    return (
+        f"Expected success but got exit code {result.returncode}\n"
+        f"--- stdout ---\n{stdout}\n--- stderr ---\n{stderr}"
+    )
+
+
+def write_executable(path: Path, content: str | bytes) -> None:
+    data = content if isinstance(content, bytes) else content.encode("utf-8")
+    path.write_bytes(data)
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
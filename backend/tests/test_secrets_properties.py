@@ -4,6 +4,8 @@ This module contains property-based tests using Hypothesis to verify
 correctness properties of the Secret Manager across a wide range of inputs.
 """
 
+import json
+
 import pytest
 from hypothesis import given, strategies as st, settings
 
@@ -52,18 +54,26 @@ def field_name_strategy(draw):
     return draw(charset)
 
 
+# Canonical field names exercised by the resolution tests. ``field`` only has a
+# handful of meaningful values (login fields, notes, or a custom field), so it is
+# fixed at collection time via ``pytest.mark.parametrize`` instead of being drawn.
+CANONICAL_FIELDS = ["password", "username", "notes", "custom"]
+
+
 @st.composite
-def bitwarden_reference_strategy(draw):
+def bitwarden_reference_strategy(draw, field=None):
     """
     Generate valid Bitwarden reference notation strings.
     
     Format: {{ bw:item-id:field }}
     
     This strategy generates references with varying amounts of whitespace
-    to test the parser's robustness.
+    to test the parser's robustness. When ``field`` is given, only the item ID
+    and whitespace are drawn.
     """
     item_id = draw(item_id_strategy())
-    field = draw(field_name_strategy())
+    if field is None:
+        field = draw(field_name_strategy())
     
     # Generate optional whitespace
     ws_before_bw = draw(st.text(alphabet=' \t', max_size=3))
@@ -77,6 +87,36 @@ def bitwarden_reference_strategy(draw):
     return reference, item_id.strip(), field.strip()
 
 
+# Bitwarden item payload shared across examples. Only the leaf strings change
+# between examples, so the structure is allocated once and mutated in place.
+_MOCK_ITEM_DATA = {
+    "id": None,
+    "login": {"password": None, "username": None},
+    "fields": [{"name": None, "value": None}],
+    "notes": None,
+}
+
+
+def build_mock_item_payload(item_id, field, secret_value):
+    """
+    Return the encoded `bw get item` output for a mocked Bitwarden item.
+
+    The requested ``field`` resolves to ``secret_value`` whether it is a login
+    field, the notes, or a custom field.
+    """
+    login = _MOCK_ITEM_DATA["login"]
+    custom_field = _MOCK_ITEM_DATA["fields"][0]
+
+    _MOCK_ITEM_DATA["id"] = item_id
+    login["password"] = secret_value if field == "password" else "other-password"
+    login["username"] = secret_value if field == "username" else "other-username"
+    custom_field["name"] = field
+    custom_field["value"] = secret_value
+    _MOCK_ITEM_DATA["notes"] = secret_value if field == "notes" else "other-notes"
+
+    return json.dumps(_MOCK_ITEM_DATA).encode()
+
+
 class TestSecretManagerProperties:
     """Property-based tests for SecretManager."""
 
@@ -207,9 +247,10 @@ class TestSecretManagerProperties:
                 secret_manager.parse_reference(invalid_text)
 
 
-    @settings(max_examples=100)
+    @pytest.mark.parametrize("field", CANONICAL_FIELDS)
+    @settings(max_examples=25)
     @given(
-        reference_data=bitwarden_reference_strategy(),
+        data=st.data(),
         secret_value=st.text(min_size=1, max_size=100),
         session_id=st.text(
             alphabet=st.characters(categories=('Lu', 'Ll', 'Nd'), include_characters='-'),
@@ -225,7 +266,8 @@ class TestSecretManagerProperties:
     @pytest.mark.asyncio
     async def test_property_6_reference_resolution(
         self,
-        reference_data,
+        field,
+        data,
         secret_value,
         session_id,
         bw_session_key
@@ -246,29 +288,15 @@ class TestSecretManagerProperties:
         **Validates: Requirements 2.2**
         """
         from unittest.mock import AsyncMock, patch
-        import json
         
         secret_manager = SecretManager()
-        reference, item_id, field = reference_data
-        
-        # Create mock Bitwarden item data
-        mock_item_data = {
-            "id": item_id,
-            "login": {
-                "password": secret_value if field == "password" else "other-password",
-                "username": secret_value if field == "username" else "other-username",
-            },
-            "fields": [
-                {"name": field, "value": secret_value}
-            ],
-            "notes": secret_value if field == "notes" else "other-notes"
-        }
+        reference, item_id, field = data.draw(bitwarden_reference_strategy(field=field))
         
         # Mock the Bitwarden CLI subprocess
         mock_process = AsyncMock()
         mock_process.returncode = 0
         mock_process.communicate = AsyncMock(
-            return_value=(json.dumps(mock_item_data).encode(), b"")
+            return_value=(build_mock_item_payload(item_id, field, secret_value), b"")
         )
         
         with patch('asyncio.create_subprocess_exec', return_value=mock_process):
@@ -363,7 +391,6 @@ class TestSecretManagerProperties:
         **Validates: Requirements 2.3**
         """
         from unittest.mock import AsyncMock, patch
-        import json
         
         secret_manager = SecretManager()
         reference, item_id, field = reference_data
@@ -442,9 +469,10 @@ class TestSecretManagerProperties:
             )
 
 
-    @settings(max_examples=100)
+    @pytest.mark.parametrize("field", CANONICAL_FIELDS)
+    @settings(max_examples=25)
     @given(
-        reference_data=bitwarden_reference_strategy(),
+        data=st.data(),
         secret_value=st.text(min_size=1, max_size=100),
         session_id=st.text(
             alphabet=st.characters(categories=('Lu', 'Ll', 'Nd'), include_characters='-'),
@@ -460,7 +488,8 @@ class TestSecretManagerProperties:
     @pytest.mark.asyncio
     async def test_property_8_no_disk_writes(
         self,
-        reference_data,
+        field,
+        data,
         secret_value,
         session_id,
         bw_session_key
@@ -480,30 +509,16 @@ class TestSecretManagerProperties:
         **Validates: Requirements 2.4, 7.3**
         """
         from unittest.mock import AsyncMock, patch, mock_open, MagicMock
-        import json
         import builtins
         
         secret_manager = SecretManager()
-        reference, item_id, field = reference_data
-        
-        # Create mock Bitwarden item data
-        mock_item_data = {
-            "id": item_id,
-            "login": {
-                "password": secret_value if field == "password" else "other-password",
-                "username": secret_value if field == "username" else "other-username",
-            },
-            "fields": [
-                {"name": field, "value": secret_value}
-            ],
-            "notes": secret_value if field == "notes" else "other-notes"
-        }
+        reference, item_id, field = data.draw(bitwarden_reference_strategy(field=field))
         
         # Mock the Bitwarden CLI subprocess
         mock_process = AsyncMock()
         mock_process.returncode = 0
         mock_process.communicate = AsyncMock(
-            return_value=(json.dumps(mock_item_data).encode(), b"")
+            return_value=(build_mock_item_payload(item_id, field, secret_value), b"")
         )
         
         # Track all file operations
@@ -595,9 +610,10 @@ class TestSecretManagerProperties:
                     )
 
 
-    @settings(max_examples=100)
+    @pytest.mark.parametrize("field", CANONICAL_FIELDS)
+    @settings(max_examples=25)
     @given(
-        reference_data=bitwarden_reference_strategy(),
+        data=st.data(),
         secret_value=st.text(min_size=1, max_size=100),
         session_id=st.text(
             alphabet=st.characters(categories=('Lu', 'Ll', 'Nd'), include_characters='-'),
@@ -613,7 +629,8 @@ class TestSecretManagerProperties:
     @pytest.mark.asyncio
     async def test_property_23_secret_caching(
         self,
-        reference_data,
+        field,
+        data,
         secret_value,
         session_id,
         bw_session_key
@@ -634,29 +651,15 @@ class TestSecretManagerProperties:
         **Validates: Requirements 7.1, 7.4**
         """
         from unittest.mock import AsyncMock, patch
-        import json
         
         secret_manager = SecretManager()
-        reference, item_id, field = reference_data
-        
-        # Create mock Bitwarden item data
-        mock_item_data = {
-            "id": item_id,
-            "login": {
-                "password": secret_value if field == "password" else "other-password",
-                "username": secret_value if field == "username" else "other-username",
-            },
-            "fields": [
-                {"name": field, "value": secret_value}
-            ],
-            "notes": secret_value if field == "notes" else "other-notes"
-        }
+        reference, item_id, field = data.draw(bitwarden_reference_strategy(field=field))
         
         # Mock the Bitwarden CLI subprocess
         mock_process = AsyncMock()
         mock_process.returncode = 0
         mock_process.communicate = AsyncMock(
-            return_value=(json.dumps(mock_item_data).encode(), b"")
+            return_value=(build_mock_item_payload(item_id, field, secret_value), b"")
         )
         
         with patch('asyncio.create_subprocess_exec', return_value=mock_process):
@@ -772,9 +775,10 @@ class TestSecretManagerProperties:
             )
 
 
-    @settings(max_examples=100)
+    @pytest.mark.parametrize("field", CANONICAL_FIELDS)
+    @settings(max_examples=25)
     @given(
-        reference_data=bitwarden_reference_strategy(),
+        data=st.data(),
         secret_value=st.text(min_size=1, max_size=100),
         session_id=st.text(
             alphabet=st.characters(categories=('Lu', 'Ll', 'Nd'), include_characters='-'),
@@ -790,7 +794,8 @@ class TestSecretManagerProperties:
     @pytest.mark.asyncio
     async def test_property_25_cache_expiration(
         self,
-        reference_data,
+        field,
+        data,
         secret_value,
         session_id,
         bw_session_key
@@ -813,29 +818,15 @@ class TestSecretManagerProperties:
         """
         from unittest.mock import AsyncMock, patch
         from datetime import datetime, timedelta
-        import json
         
         secret_manager = SecretManager()
-        reference, item_id, field = reference_data
-        
-        # Create mock Bitwarden item data
-        mock_item_data = {
-            "id": item_id,
-            "login": {
-                "password": secret_value if field == "password" else "other-password",
-                "username": secret_value if field == "username" else "other-username",
-            },
-            "fields": [
-                {"name": field, "value": secret_value}
-            ],
-            "notes": secret_value if field == "notes" else "other-notes"
-        }
+        reference, item_id, field = data.draw(bitwarden_reference_strategy(field=field))
         
         # Mock the Bitwarden CLI subprocess
         mock_process = AsyncMock()
         mock_process.returncode = 0
         mock_process.communicate = AsyncMock(
-            return_value=(json.dumps(mock_item_data).encode(), b"")
+            return_value=(build_mock_item_payload(item_id, field, secret_value), b"")
         )
         
         with patch('asyncio.create_subprocess_exec', return_value=mock_process):
@@ -1,13 +1,19 @@
 """SessionService のセッション作成および実行管理を検証するテスト。"""
 
+from __future__ import annotations
+
 import asyncio
+import contextlib
+import os
+import shutil
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
-from unittest.mock import AsyncMock
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
 
 import pytest
 
+from app.models.containers import ContainerConfig
 from app.models.state import JobRecord, SessionRecord
 from app.models.signature import (
     PermitUnsignedEntry,
@@ -18,14 +24,63 @@ from app.services.containers import ContainerError
 from app.services.metrics import MetricsRecorder
 from app.services.sessions import SessionService
 
+# 各テストは独立したストア内容・tmp_path・モックを使うため、
+# pytest-xdist (`pytest -n auto`) でワーカーへ分散しても干渉しない。
+pytestmark = pytest.mark.asyncio
+
+# 署名検証テストで共通利用するポリシー（検証コストを避けるため 1 度だけ生成する）
+_ENFORCE_POLICY = SignaturePolicy(
+    verify_signatures=True,
+    mode="enforcement",
+    permit_unsigned=[],
+    allowed_algorithms=["RSA-PSS-SHA256"],
+)
+_AUDIT_POLICY = _ENFORCE_POLICY.model_copy(update={"mode": "audit-only"})
+
+# permit_unsigned テストで使うイメージ参照と例外エントリ
+_IMAGE_123 = "ghcr.io/example/server:1.2.3"
+_IMAGE_THUMB = "ghcr.io/example/server:thumb"
+_DIGEST = "sha256:" + "a" * 64
+_IMAGE_DIGEST = f"ghcr.io/example/server@{_DIGEST}"
+_THUMBPRINT = "ABCDEF1234567890"
+_PERMIT_IMAGE = PermitUnsignedEntry(type="image", name=_IMAGE_123)
+_PERMIT_NONE = PermitUnsignedEntry(type="none")
+_PERMIT_DIGEST = PermitUnsignedEntry(type="sha256", digest=_DIGEST)
+_PERMIT_THUMB = PermitUnsignedEntry(type="thumbprint", cert=_THUMBPRINT)
+
+# トランケーション検証用の出力（output_bytes_limit の上限を超えるサイズ）
+_BIG_OUTPUT = b"A" * 130_000
+
+
+# テスト用ストアが保持する監査ログの上限（テストは末尾のみを参照する）
+_AUDIT_LOG_CAPACITY = 256
+
+
+class _AuditLog(NamedTuple):
+    """テスト用ストアに記録される監査ログ 1 件。"""
+
+    category: str
+    action: str
+    actor: str
+    target: str
+    metadata: Dict[str, object]
+
 
 class _DummyStateStore:
-    """永続化ストアの代替実装（メモリ保持のみ）。"""
+    """永続化ストアの代替実装（メモリ保持のみ）。reset() で再利用できる。"""
+
+    __slots__ = ("sessions", "jobs", "audit_logs")
 
     def __init__(self) -> None:
         self.sessions: Dict[str, SessionRecord] = {}
         self.jobs: Dict[str, JobRecord] = {}
-        self.audit_logs: List[Dict[str, object]] = []
+        self.audit_logs: Deque[_AuditLog] = deque(maxlen=_AUDIT_LOG_CAPACITY)
+
+    def reset(self) -> None:
+        """保持しているレコードを破棄し、コンテナは使い回す。"""
+        self.sessions.clear()
+        self.jobs.clear()
+        self.audit_logs.clear()
 
     def save_session(self, record: SessionRecord) -> None:
         self.sessions[record.session_id] = record
@@ -52,34 +107,178 @@ class _DummyStateStore:
         **_: object,
     ) -> None:
         """監査ログをメモリに保持する（テスト用）。"""
-        self.audit_logs.append(
-            {
-                "category": category,
-                "action": action,
-                "actor": actor,
-                "target": target,
-                "metadata": metadata,
-            }
+        self.audit_logs.append(_AuditLog(category, action, actor, target, metadata))
+
+
+def _next_result(results: List[object], call_count: int) -> object:
+    """呼び出し回数に対応する結果を返す。例外インスタンスであれば送出する。"""
+    result = results[min(call_count, len(results)) - 1]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+class _StubContainerService:
+    """
+    create_container / exec_command の呼び出しを記録する最小限の非同期スタブ。
+
+    results / exec_results の値を呼び出し順に返し、例外インスタンスであれば送出する。
+    使い切った後は最後の値を繰り返す。
+    """
+
+    def __init__(self) -> None:
+        self.results: List[object] = ["container-stub"]
+        self.calls: List[ContainerConfig] = []
+        self.exec_results: List[object] = [(0, b"")]
+        self.exec_calls: List[List[str]] = []
+
+    async def create_container(self, config: ContainerConfig, **_: object) -> str:
+        self.calls.append(config)
+        return _next_result(self.results, len(self.calls))  # type: ignore[return-value]
+
+    async def exec_command(self, container_id: str, command: List[str]) -> tuple[int, bytes]:
+        self.exec_calls.append(command)
+        return _next_result(self.exec_results, len(self.exec_calls))  # type: ignore[return-value]
+
+
+class _StubSignatureVerifier:
+    """verify_image の呼び出し回数を数え、指定があれば例外を送出する署名検証スタブ。"""
+
+    def __init__(self, error: Optional[SignatureVerificationError] = None) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def verify_image(self, **_: object) -> None:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture(scope="module")
+def _state_store() -> _DummyStateStore:
+    """モジュール内で共有するメモリストア。"""
+    return _DummyStateStore()
+
+
+@pytest.fixture(autouse=True)
+def _reset_state_store(_state_store: _DummyStateStore) -> None:
+    """テストごとに共有ストアの内容を空に戻す。"""
+    _state_store.reset()
+
+
+def _bundle_paths(bundle_dir: Path) -> Dict[str, str]:
+    """_ensure_mtls_bundle と同じ形式のバンドル情報を返す。"""
+    return {
+        "bundle_dir": str(bundle_dir),
+        "cert_path": str(bundle_dir / "server.crt"),
+        "key_path": str(bundle_dir / "server.key"),
+        "ca_path": str(bundle_dir / "ca.crt"),
+    }
+
+
+@pytest.fixture(scope="module")
+def _shared_certs(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """実際の生成処理で mTLS バンドルを 1 度だけ作成し、モジュール内で共有する。"""
+    cert_base_dir = tmp_path_factory.mktemp("certs")
+    generator = SessionService(
+        container_service=_StubContainerService(),
+        state_store=_DummyStateStore(),
+        cert_base_dir=cert_base_dir,
+    )
+    bundle = generator._ensure_mtls_bundle("shared")
+    return Path(bundle["bundle_dir"])
+
+
+@pytest.fixture(autouse=True)
+def _reuse_shared_certs(_shared_certs: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    モジュール内の全 SessionService で鍵生成を省略する。
+
+    _ensure_mtls_bundle をクラス単位で差し替え、共有済みのバンドルを
+    セッション用ディレクトリへコピーするだけにする。
+    """
+
+    def _copy_shared_bundle(self: SessionService, session_id: str) -> Dict[str, str]:
+        bundle_dir = self.cert_base_dir / session_id
+        shutil.copytree(_shared_certs, bundle_dir)
+        return _bundle_paths(bundle_dir)
+
+    monkeypatch.setattr(SessionService, "_ensure_mtls_bundle", _copy_shared_bundle)
+
+
+@pytest.fixture(scope="session")
+def cert_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """全テストで共有する証明書ルート。後始末はセッション終了時のみ行う。"""
+    return tmp_path_factory.mktemp("cert_base")
+
+
+@pytest.fixture
+def service_factory(
+    cert_root: Path, request: pytest.FixtureRequest, _state_store: _DummyStateStore
+) -> Callable[..., SessionService]:
+    """
+    独立した SessionService を生成するファクトリ。
+
+    コンテナ操作は呼び出しごとの _StubContainerService で代替し、
+    ストアと証明書ディレクトリはテスト内で共有する。
+    with_certs=False（既定）の場合は証明書ファイルを作らず、パスだけを返す
+    生成関数を注入する。
+    """
+    cert_base_dir = cert_root / request.node.name
+
+    def _paths_only(session_id: str) -> Dict[str, str]:
+        return _bundle_paths(cert_base_dir / session_id)
+
+    def _factory(*, with_certs: bool = False) -> SessionService:
+        return SessionService(
+            container_service=_StubContainerService(),
+            state_store=_state_store,
+            cert_base_dir=cert_base_dir,
+            mtls_generator=None if with_certs else _paths_only,
         )
 
+    return _factory
+
 
-@pytest.mark.asyncio
-async def test_create_session_applies_isolation_and_limits(tmp_path: Path) -> None:
+@pytest.fixture
+def service(service_factory: Callable[..., SessionService]) -> SessionService:
+    """証明書ファイルを生成しない SessionService。"""
+    return service_factory()
+
+
+@pytest.fixture
+def service_with_certs(service_factory: Callable[..., SessionService]) -> SessionService:
+    """共有バンドルのコピーで実際の証明書ファイルを配置する SessionService。"""
+    return service_factory(with_certs=True)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch: pytest.MonkeyPatch) -> datetime:
+    """app.services.sessions が参照する現在時刻を固定し、その値を返す。"""
+    fixed = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):  # type: ignore[override]
+            return fixed if tz is not None else fixed.replace(tzinfo=None)
+
+    monkeypatch.setattr("app.services.sessions.datetime", _FrozenDatetime)
+    return fixed
+
+
+async def test_create_session_applies_isolation_and_limits(
+    service_with_certs: SessionService, frozen_now: datetime
+) -> None:
     """
     セッション作成時にネットワーク分離と cgroup 制限が付与され、
     idle_deadline が 30 分先に設定されることを検証する。
     さらに mTLS バンドルが生成され、ボリュームマウントが付与される。
     """
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-123"
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    service = service_with_certs
+    container_service = service.container_service
+    container_service.results = ["container-123"]
+    state_store = service.state_store
 
-    before = datetime.now(timezone.utc)
     record = await service.create_session(
         server_id="server-a",
         image="ghcr.io/example/server:1.0.0",
@@ -88,8 +287,8 @@ async def test_create_session_applies_isolation_and_limits(tmp_path: Path) -> No
         correlation_id="corr-1",
     )
 
-    container_service.create_container.assert_awaited()
-    config_arg = container_service.create_container.call_args[0][0]
+    assert container_service.calls
+    config_arg = container_service.calls[-1]
     assert config_arg.cpus == 0.5
     assert config_arg.memory_limit == "512m"
     assert config_arg.network_mode == "none"
@@ -97,9 +296,7 @@ async def test_create_session_applies_isolation_and_limits(tmp_path: Path) -> No
     assert config_arg.labels.get("mcp.server_id") == "server-a"
     assert config_arg.volumes  # mTLS バンドルをマウントしていること
 
-    lower_bound = before + timedelta(minutes=29, seconds=50)
-    upper_bound = before + timedelta(minutes=30, seconds=10)
-    assert lower_bound <= record.idle_deadline <= upper_bound
+    assert record.idle_deadline == frozen_now + timedelta(minutes=30)
     saved = state_store.get_session(record.session_id)
     assert saved == record
     assert record.mtls_cert_ref is not None
@@ -108,77 +305,64 @@ async def test_create_session_applies_isolation_and_limits(tmp_path: Path) -> No
         Path(record.mtls_cert_ref["key_path"]),
         Path(record.mtls_cert_ref["ca_path"]),
     ]
+    # 3 ファイルは同じバンドルディレクトリにあるため、1 回の走査でまとめて確認する
+    bundle_dir = cert_paths[0].parent
+    assert all(path.parent == bundle_dir for path in cert_paths)
+    with os.scandir(bundle_dir) as entries:
+        names = {entry.name for entry in entries}
     for path in cert_paths:
-        assert path.exists()
-
-
-@pytest.mark.asyncio
-async def test_create_session_retries_once_on_failure(tmp_path: Path) -> None:
-    """コンテナ作成が 1 回失敗しても 2 回目で成功すればセッションが作成される。"""
-    container_service = AsyncMock()
-    container_service.create_container.side_effect = [
-        ContainerError("first failure"),
-        "container-ok",
-    ]
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
-
-    record = await service.create_session(
-        server_id="server-b",
-        image="ghcr.io/example/server:2.0.0",
-        env={},
-        bw_session_key="bw-session",
-        correlation_id="corr-2",
-    )
-
-    assert container_service.create_container.await_count == 2
-    assert record.gateway_endpoint.endswith("container-ok")
-    assert state_store.get_session(record.session_id) is not None
-
-
-@pytest.mark.asyncio
-async def test_create_session_raises_after_two_failures(tmp_path: Path) -> None:
-    """コンテナ作成が連続で失敗した場合は例外を送出し、ストアへ保存しない。"""
-    container_service = AsyncMock()
-    container_service.create_container.side_effect = [
-        ContainerError("first failure"),
-        ContainerError("second failure"),
-    ]
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
-
-    with pytest.raises(ContainerError):
-        await service.create_session(
-            server_id="server-c",
-            image="ghcr.io/example/server:3.0.0",
+        assert path.name in names
+
+
+@pytest.mark.parametrize(
+    ("results", "raises"),
+    [
+        pytest.param(
+            [ContainerError("first failure"), "container-ok"], None, id="retry_succeeds"
+        ),
+        pytest.param(
+            [ContainerError("first failure"), ContainerError("second failure")],
+            ContainerError,
+            id="two_failures",
+        ),
+    ],
+)
+async def test_create_session_retry_matrix(
+    service: SessionService, results: List[object], raises: Optional[type]
+) -> None:
+    """
+    コンテナ作成は 1 回だけ再試行される。
+    2 回目で成功すればセッションを保存し、連続で失敗すれば例外を送出してストアへ保存しない。
+    """
+    container_service = service.container_service
+    container_service.results = results
+    state_store = service.state_store
+
+    with pytest.raises(raises) if raises else contextlib.nullcontext():
+        record = await service.create_session(
+            server_id="server-b",
+            image="ghcr.io/example/server:2.0.0",
             env={},
             bw_session_key="bw-session",
-            correlation_id="corr-3",
+            correlation_id="corr-2",
         )
 
-    assert container_service.create_container.await_count == 2
-    assert state_store.sessions == {}
+    assert len(container_service.calls) == 2
+    if raises:
+        assert state_store.sessions == {}
+    else:
+        assert record.gateway_endpoint.endswith("container-ok")
+        assert state_store.get_session(record.session_id) is not None
 
 
-@pytest.mark.asyncio
-async def test_create_session_cleans_mtls_bundle_on_failure(tmp_path: Path) -> None:
+async def test_create_session_cleans_mtls_bundle_on_failure(
+    service_with_certs: SessionService,
+) -> None:
     """コンテナ起動に失敗した場合でも一時証明書ディレクトリを掃除する。"""
-    container_service = AsyncMock()
-    container_service.create_container.side_effect = ContainerError("boom")
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    service = service_with_certs
+    container_service = service.container_service
+    container_service.results = [ContainerError("boom")]
+    state_store = service.state_store
 
     with pytest.raises(ContainerError):
         await service.create_session(
@@ -190,34 +374,23 @@ async def test_create_session_cleans_mtls_bundle_on_failure(tmp_path: Path) -> N
         )
 
     assert state_store.sessions == {}
-    assert list(tmp_path.iterdir()) == []
+    assert list(service.cert_base_dir.iterdir()) == []
 
 
-@pytest.mark.asyncio
 async def test_create_session_blocks_when_signature_verification_fails(
-    tmp_path: Path,
+    service: SessionService,
 ) -> None:
     """署名検証が enforcement で失敗した場合はコンテナ起動を中断する。"""
-    container_service = AsyncMock()
-    signature_verifier = AsyncMock()
-    signature_verifier.verify_image.side_effect = SignatureVerificationError(
-        error_code="invalid_signature",
-        message="署名が無効です",
-        remediation="鍵の配布を確認してください",
-    )
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-    )
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="enforcement",
-        permit_unsigned=[],
-        allowed_algorithms=["RSA-PSS-SHA256"],
+    container_service = service.container_service
+    signature_verifier = _StubSignatureVerifier(
+        SignatureVerificationError(
+            error_code="invalid_signature",
+            message="署名が無効です",
+            remediation="鍵の配布を確認してください",
+        )
     )
+    service.signature_verifier = signature_verifier
+    policy = _ENFORCE_POLICY
 
     with pytest.raises(SignatureVerificationError):
         await service.create_session(
@@ -229,180 +402,65 @@ async def test_create_session_blocks_when_signature_verification_fails(
             signature_policy=policy,
         )
 
-    signature_verifier.verify_image.assert_awaited_once()
-    container_service.create_container.assert_not_awaited()
+    assert signature_verifier.calls == 1
+    assert container_service.calls == []
 
 
-@pytest.mark.asyncio
 async def test_create_session_skips_when_permit_unsigned_matches(
-    tmp_path: Path,
-) -> None:
-    """permit_unsigned にマッチする場合は署名検証をスキップする。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-permit"
-    signature_verifier = AsyncMock()
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-    )
-    image = "ghcr.io/example/server:1.2.3"
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="enforcement",
-        permit_unsigned=[PermitUnsignedEntry(type="image", name=image)],
-        allowed_algorithms=["RSA-PSS-SHA256"],
-    )
-
-    record = await service.create_session(
-        server_id="server-permit",
-        image=image,
-        env={},
-        bw_session_key="bw-session",
-        correlation_id="corr-sig-permit",
-        signature_policy=policy,
-    )
-
-    signature_verifier.verify_image.assert_not_awaited()
-    container_service.create_container.assert_awaited_once()
-    assert state_store.get_session(record.session_id) is not None
-
-
-@pytest.mark.asyncio
-async def test_create_session_skips_when_permit_unsigned_none(tmp_path: Path) -> None:
-    """permit_unsigned に none が含まれる場合は署名検証をスキップする。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-permit-none"
-    signature_verifier = AsyncMock()
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-    )
-    image = "ghcr.io/example/server:1.2.3"
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="enforcement",
-        permit_unsigned=[PermitUnsignedEntry(type="none")],
-        allowed_algorithms=["RSA-PSS-SHA256"],
-    )
-
-    record = await service.create_session(
-        server_id="server-permit-none",
-        image=image,
-        env={},
-        bw_session_key="bw-session",
-        correlation_id="corr-sig-permit-none",
-        signature_policy=policy,
-    )
-
-    signature_verifier.verify_image.assert_not_awaited()
-    container_service.create_container.assert_awaited_once()
-    assert state_store.get_session(record.session_id) is not None
-
-
-@pytest.mark.asyncio
-async def test_create_session_skips_when_permit_unsigned_digest(tmp_path: Path) -> None:
-    """ダイジェスト指定の permit_unsigned にマッチする場合は検証をスキップする。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-permit-digest"
-    signature_verifier = AsyncMock()
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-    )
-    digest = "sha256:" + "a" * 64
-    image = f"ghcr.io/example/server@{digest}"
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="enforcement",
-        permit_unsigned=[PermitUnsignedEntry(type="sha256", digest=digest)],
-        allowed_algorithms=["RSA-PSS-SHA256"],
-    )
-
-    record = await service.create_session(
-        server_id="server-permit-digest",
-        image=image,
-        env={},
-        bw_session_key="bw-session",
-        correlation_id="corr-sig-permit-digest",
-        signature_policy=policy,
-    )
-
-    signature_verifier.verify_image.assert_not_awaited()
-    container_service.create_container.assert_awaited_once()
-    assert state_store.get_session(record.session_id) is not None
-
-
-@pytest.mark.asyncio
-async def test_create_session_skips_when_permit_unsigned_thumbprint(
-    tmp_path: Path,
+    service_factory: Callable[..., SessionService],
 ) -> None:
-    """サムプリント指定の permit_unsigned にマッチする場合は検証をスキップする。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-permit-thumb"
-    signature_verifier = AsyncMock()
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-    )
-    thumbprint = "ABCDEF1234567890"
-    image = "ghcr.io/example/server:thumb"
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="enforcement",
-        permit_unsigned=[PermitUnsignedEntry(type="thumbprint", cert=thumbprint)],
-        allowed_algorithms=["RSA-PSS-SHA256"],
-    )
-
-    record = await service.create_session(
-        server_id="server-permit-thumb",
-        image=image,
-        env={},
-        bw_session_key="bw-session",
-        correlation_id="corr-sig-permit-thumb",
-        signature_policy=policy,
-        image_thumbprint=thumbprint,
+    """
+    permit_unsigned（イメージ名/none/ダイジェスト/サムプリント）にマッチする場合は
+    署名検証をスキップする。各パターンは独立したサービスで並行に実行する。
+    """
+    cases = [
+        ("image", _PERMIT_IMAGE, _IMAGE_123, {}),
+        ("none", _PERMIT_NONE, _IMAGE_123, {}),
+        ("digest", _PERMIT_DIGEST, _IMAGE_DIGEST, {}),
+        ("thumbprint", _PERMIT_THUMB, _IMAGE_THUMB, {"image_thumbprint": _THUMBPRINT}),
+    ]
+    services = []
+    for _ in cases:
+        svc = service_factory()
+        svc.signature_verifier = _StubSignatureVerifier()
+        services.append(svc)
+
+    records = await asyncio.gather(
+        *(
+            svc.create_session(
+                server_id=f"server-permit-{case_id}",
+                image=image,
+                env={},
+                bw_session_key="bw-session",
+                correlation_id=f"corr-sig-permit-{case_id}",
+                signature_policy=_ENFORCE_POLICY.model_copy(
+                    update={"permit_unsigned": [entry]}
+                ),
+                **extra_kwargs,
+            )
+            for svc, (case_id, entry, image, extra_kwargs) in zip(services, cases)
+        )
     )
 
-    signature_verifier.verify_image.assert_not_awaited()
-    container_service.create_container.assert_awaited_once()
-    assert state_store.get_session(record.session_id) is not None
+    for svc, record, (case_id, *_) in zip(services, records, cases):
+        assert svc.signature_verifier.calls == 0, case_id
+        assert len(svc.container_service.calls) == 1, case_id
+        assert svc.state_store.get_session(record.session_id) is not None, case_id
 
 
-@pytest.mark.asyncio
-async def test_create_session_allows_audit_only_on_failure(tmp_path: Path) -> None:
+async def test_create_session_allows_audit_only_on_failure(service: SessionService) -> None:
     """audit-only モードでは署名検証失敗時でも起動を継続する。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-audit"
-    signature_verifier = AsyncMock()
-    signature_verifier.verify_image.side_effect = SignatureVerificationError(
-        error_code="invalid_signature",
-        message="署名が無効です",
-    )
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-    )
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="audit-only",
-        permit_unsigned=[],
-        allowed_algorithms=["RSA-PSS-SHA256"],
+    container_service = service.container_service
+    container_service.results = ["container-audit"]
+    signature_verifier = _StubSignatureVerifier(
+        SignatureVerificationError(
+            error_code="invalid_signature",
+            message="署名が無効です",
+        )
     )
+    service.signature_verifier = signature_verifier
+    state_store = service.state_store
+    policy = _AUDIT_POLICY
 
     record = await service.create_session(
         server_id="server-audit",
@@ -413,36 +471,25 @@ async def test_create_session_allows_audit_only_on_failure(tmp_path: Path) -> No
         signature_policy=policy,
     )
 
-    signature_verifier.verify_image.assert_awaited_once()
-    container_service.create_container.assert_awaited_once()
+    assert signature_verifier.calls == 1
+    assert len(container_service.calls) == 1
     assert state_store.get_session(record.session_id) is not None
     assert state_store.audit_logs
     last_log = state_store.audit_logs[-1]
-    assert last_log["metadata"]["error_code"] == "invalid_signature"
-    assert last_log["metadata"]["mode"] == "audit-only"
+    assert last_log.metadata["error_code"] == "invalid_signature"
+    assert last_log.metadata["mode"] == "audit-only"
 
 
-@pytest.mark.asyncio
-async def test_signature_verification_records_metrics_and_audit(tmp_path: Path) -> None:
+async def test_signature_verification_records_metrics_and_audit(service: SessionService) -> None:
     """署名検証成功時にメトリクスと監査ログが記録される。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-metrics"
-    signature_verifier = AsyncMock()
+    container_service = service.container_service
+    container_service.results = ["container-metrics"]
+    signature_verifier = _StubSignatureVerifier()
+    service.signature_verifier = signature_verifier
     metrics = MetricsRecorder()
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-        signature_verifier=signature_verifier,
-        metrics=metrics,
-    )
-    policy = SignaturePolicy(
-        verify_signatures=True,
-        mode="enforcement",
-        permit_unsigned=[],
-        allowed_algorithms=["RSA-PSS-SHA256"],
-    )
+    service.metrics = metrics
+    state_store = service.state_store
+    policy = _ENFORCE_POLICY
 
     record = await service.create_session(
         server_id="server-metrics",
@@ -458,24 +505,21 @@ async def test_signature_verification_records_metrics_and_audit(tmp_path: Path)
         {"mode": "enforcement", "result": "success"},
     ) == 1
     assert any(
-        log["action"] == "signature_verification_success"
-        and log["target"] == "corr-sig-success"
+        log.action == "signature_verification_success"
+        and log.target == "corr-sig-success"
         for log in state_store.audit_logs
     )
     assert record.mtls_cert_ref is not None
 
 
-@pytest.mark.asyncio
-async def test_cleanup_session_removes_mtls_bundle(tmp_path: Path) -> None:
+async def test_cleanup_session_removes_mtls_bundle(
+    service_with_certs: SessionService,
+) -> None:
     """セッション終了時に mTLS バンドルが削除される。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-cleanup"
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    service = service_with_certs
+    container_service = service.container_service
+    container_service.results = ["container-cleanup"]
+    state_store = service.state_store
 
     record = await service.create_session(
         server_id="server-cleanup",
@@ -494,17 +538,11 @@ async def test_cleanup_session_removes_mtls_bundle(tmp_path: Path) -> None:
     assert not bundle_dir.exists()
 
 
-@pytest.mark.asyncio
-async def test_update_session_config_persists_runtime_limits(tmp_path: Path) -> None:
+async def test_update_session_config_persists_runtime_limits(service: SessionService) -> None:
     """max_run_seconds と output_bytes_limit の更新が永続化される。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-123"
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    container_service = service.container_service
+    container_service.results = ["container-123"]
+    state_store = service.state_store
     record = await service.create_session(
         server_id="server-d",
         image="ghcr.io/example/server:4.0.0",
@@ -527,17 +565,10 @@ async def test_update_session_config_persists_runtime_limits(tmp_path: Path) ->
     assert saved.config.get("runtime", {}).get("max_run_seconds") == 120
 
 
-@pytest.mark.asyncio
-async def test_update_session_config_clamps_out_of_range(tmp_path: Path) -> None:
+async def test_update_session_config_clamps_out_of_range(service: SessionService) -> None:
     """設定値が範囲外の場合に上限・下限へ丸められる。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-clamp"
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    container_service = service.container_service
+    container_service.results = ["container-clamp"]
     record = await service.create_session(
         server_id="server-clamp",
         image="ghcr.io/example/server:4.0.0",
@@ -557,18 +588,32 @@ async def test_update_session_config_clamps_out_of_range(tmp_path: Path) -> None
     assert runtime["output_bytes_limit"] == 1_000_000
 
 
-@pytest.mark.asyncio
-async def test_execute_sync_applies_timeout_and_truncation(tmp_path: Path) -> None:
+class _SyncExecCase(NamedTuple):
+    """同期実行のシナリオ。exec_result は stub が返す値、または送出する例外。"""
+
+    exec_result: object
+    output_bytes: int
+    exit_code: int
+    timeout: bool
+    truncated: bool
+
+
+@pytest.mark.parametrize(
+    "case",
+    [
+        # 出力が上限を超えた場合は切り詰める
+        pytest.param(_SyncExecCase((0, _BIG_OUTPUT), 50_000, 0, False, True), id="truncation"),
+        # タイムアウトは exit_code=124 として扱う
+        # （Python 3.11 以降は asyncio.TimeoutError が組み込みの TimeoutError と同一）
+        pytest.param(_SyncExecCase(TimeoutError(), 0, 124, True, False), id="timeout_124"),
+    ],
+)
+async def test_execute_sync_applies_timeout_and_truncation(
+    service: SessionService, case: _SyncExecCase
+) -> None:
     """同期実行でタイムアウト/トランケーションが適用される。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-789"
-    container_service.exec_command.return_value = (0, b"A" * 130_000)
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    container_service = service.container_service
+    container_service.exec_results = [case.exec_result]
     record = await service.create_session(
         server_id="server-e",
         image="ghcr.io/example/server:5.0.0",
@@ -586,63 +631,19 @@ async def test_execute_sync_applies_timeout_and_truncation(tmp_path: Path) -> No
         output_bytes_limit=50_000,
     )
 
-    container_service.exec_command.assert_awaited()
-    assert result.exit_code == 0
-    assert result.timeout is False
-    assert result.truncated is True
-    assert len(result.output.encode("utf-8")) == 50_000
-
-
-@pytest.mark.asyncio
-async def test_execute_timeout_sets_exit_code_124(tmp_path: Path) -> None:
-    """実行がタイムアウトした場合に exit_code=124 として扱う。"""
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-timeout"
-    container_service.exec_command.side_effect = asyncio.TimeoutError
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
-    record = await service.create_session(
-        server_id="server-f",
-        image="ghcr.io/example/server:6.0.0",
-        env={},
-        bw_session_key="bw-session",
-        correlation_id="corr-6",
-    )
-
-    result = await service.execute_command(
-        session_id=record.session_id,
-        tool="sleep",
-        args=["2"],
-        async_mode=False,
-        max_run_seconds=1,
-    )
+    assert len(container_service.exec_calls) == 1
+    assert result.exit_code == case.exit_code
+    assert result.timeout is case.timeout
+    assert result.truncated is case.truncated
+    assert len(result.output.encode("utf-8")) == case.output_bytes
 
-    assert result.timeout is True
-    assert result.exit_code == 124
-    assert result.output == ""
-    assert result.truncated is False
 
-
-@pytest.mark.asyncio
-async def test_execute_async_records_job_result(tmp_path: Path) -> None:
+async def test_execute_async_records_job_result(service: SessionService) -> None:
     """非同期実行でジョブ状態と出力が保存・取得できる。"""
-    async def _exec_command(container_id: str, command: List[str]) -> tuple[int, bytes]:
-        await asyncio.sleep(0)
-        return 0, b"async-output"
-
-    container_service = AsyncMock()
-    container_service.create_container.return_value = "container-async"
-    container_service.exec_command.side_effect = _exec_command
-    state_store = _DummyStateStore()
-    service = SessionService(
-        container_service=container_service,
-        state_store=state_store,
-        cert_base_dir=tmp_path,
-    )
+    container_service = service.container_service
+    container_service.results = ["container-async"]
+    container_service.exec_results = [(0, b"async-output")]
+    state_store = service.state_store
     record = await service.create_session(
         server_id="server-g",
         image="ghcr.io/example/server:7.0.0",
@@ -658,8 +659,9 @@ async def test_execute_async_records_job_result(tmp_path: Path) -> None:
         async_mode=True,
     )
 
-    # バックグラウンドタスクの完了を待機
-    await asyncio.sleep(0)
+    # バックグラウンドタスクを直接待機し、ハングした場合は 1 秒で打ち切る
+    async with asyncio.timeout(1):
+        assert await service.wait_for_job(job.job_id)
 
     status = await service.get_job_status(job.job_id)
     assert status is not None
@@ -43,14 +43,13 @@ def test_resolve_official_returns_expected_registry():
     assert "modelcontextprotocol.io" in resolved_url or resolved_url.startswith("http")
 
 
-def test_resolve_source_url_mapping_is_exhaustive():
+@pytest.mark.parametrize("source_id", list(CatalogSourceId), ids=lambda s: s.name)
+def test_resolve_source_url_mapping_is_exhaustive(source_id):
     """All CatalogSourceId enum members have URL mappings."""
-    # Ensure every source ID can be resolved
-    for source_id in CatalogSourceId:
-        resolved_url = _resolve_source_url(source_id)
-        assert isinstance(resolved_url, str)
-        assert len(resolved_url) > 0
-        assert resolved_url.startswith("http")
+    resolved_url = _resolve_source_url(source_id)
+    assert isinstance(resolved_url, str)
+    assert len(resolved_url) > 0
+    assert resolved_url.startswith("http")
 
 
 def test_resolve_source_url_returns_distinct_urls():
@@ -1,9 +1,14 @@
 """永続化ストアのTDDテスト。"""
 
+from __future__ import annotations
+
 import json
 import sqlite3
-from datetime import datetime, timedelta, timezone
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, NamedTuple
 
 import pytest
 
@@ -16,16 +21,55 @@ from app.models.state import (
     SessionRecord,
     SignaturePolicyRecord,
 )
-from app.services.state_store import StateStore
+from app.services.state_store import _SCHEMA_VERSION, StateStore
+
+
+class _TableSchema(NamedTuple):
+    """PRAGMA から読み出したテーブル定義。"""
+
+    columns: frozenset[str]
+    pk: tuple[str, ...]
+    indexes: Dict[str, tuple[str, ...]]
+
+
+@pytest.fixture(scope="module")
+def schema_snapshot(state_store_template: Path) -> Dict[str, _TableSchema]:
+    """
+    スキーマ初期化済みテンプレートからテーブル定義を 1 度だけ読み出す。
+    スキーマはテストで変化しないため、モジュール内で共有する。
+    """
+    snapshot: Dict[str, _TableSchema] = {}
+    with closing(sqlite3.connect(state_store_template)) as conn:
+        for table in ("remote_servers", "oauth_states"):
+            # 列名・主キーは SQLite 側で集約し、1 行だけ受け取る
+            columns, pk = conn.execute(
+                """
+                SELECT group_concat(name, ','),
+                       group_concat(CASE WHEN pk > 0 THEN name END, ',')
+                FROM pragma_table_info(?)
+                """,
+                (table,),
+            ).fetchone()
+            indexes = conn.execute(
+                """
+                SELECT il.name, group_concat(ii.name, ',')
+                FROM pragma_index_list(?) AS il, pragma_index_info(il.name) AS ii
+                GROUP BY il.name
+                """,
+                (table,),
+            ).fetchall()
+            snapshot[table] = _TableSchema(
+                columns=frozenset(columns.split(",")),
+                pk=tuple(pk.split(",")) if pk else (),
+                indexes={name: tuple(cols.split(",")) if cols else () for name, cols in indexes},
+            )
+    return snapshot
 
 
 @pytest.fixture
-def store(tmp_path: Path) -> StateStore:
-    """一時ディレクトリに SQLite ストアを作成する。"""
-    db_path = tmp_path / "state.db"
-    state_store = StateStore(str(db_path))
-    state_store.init_schema()
-    return state_store
+def store(state_store_factory) -> StateStore:
+    """スキーマ初期化済みテンプレートを複製した SQLite ストアを返す。"""
+    return state_store_factory()
 
 
 def test_schema_created(store: StateStore) -> None:
@@ -46,10 +90,12 @@ def test_schema_created(store: StateStore) -> None:
     assert expected.issubset(tables)
 
 
-def test_init_schema_migrates_legacy_db_and_is_idempotent(tmp_path: Path) -> None:
+def test_init_schema_migrates_legacy_db_and_is_idempotent(
+    tmp_path: Path, fixed_now: datetime
+) -> None:
     """既存DBから新テーブル・カラムを追加しつつデータを保持できることを検証する。"""
     db_path = tmp_path / "legacy.db"
-    now = datetime.now(timezone.utc)
+    now = fixed_now
 
     # 旧スキーマ: credentials のみ（新カラムなし）
     with sqlite3.connect(db_path) as conn:
@@ -105,11 +151,85 @@ def test_init_schema_migrates_legacy_db_and_is_idempotent(tmp_path: Path) -> Non
     assert credential.oauth_client_id is None
 
 
-def test_remote_servers_table_schema(store: StateStore) -> None:
-    """remote_servers テーブルのスキーマが期待通りであることを検証する。"""
+def test_connection_is_reused_per_thread(store: StateStore) -> None:
+    """同一スレッドでは接続を使い回し、別スレッドでは別の接続を開くことを検証する。"""
+    conn = store._connect()
+    assert store._connect() is conn
+
+    other: list[sqlite3.Connection] = []
+    worker = threading.Thread(target=lambda: other.append(store._connect()))
+    worker.start()
+    worker.join()
+    assert other and other[0] is not conn
+
+    store.close()
+    assert store._connect() is not conn
+
+
+def test_init_schema_enables_wal_for_file_db(tmp_path: Path) -> None:
+    """ファイル DB では WAL と接続ごとの PRAGMA が適用されることを検証する。"""
+    store = StateStore(str(tmp_path / "wal.db"))
+    store.init_schema()
+
+    with store._connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    store.close()
+
+
+def test_init_schema_skips_when_user_version_matches(tmp_path: Path) -> None:
+    """user_version が現在のスキーマと一致する DB では DDL を再適用しない。"""
+    db_path = str(tmp_path / "versioned.db")
+    store = StateStore(db_path)
+    store.init_schema()
+    conn = store._connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == _SCHEMA_VERSION
+    conn.execute("DROP TABLE signature_policies")
+    store.close()
+
+    # バージョンが一致するため、削除したテーブルは再作成されない
+    reopened = StateStore(db_path)
+    reopened.init_schema()
+    assert "signature_policies" not in reopened.list_tables()
+
+    # バージョンが異なれば DDL を適用し直す
+    reopened._connect().execute("PRAGMA user_version = 0")
+    reopened.close()
+    migrated = StateStore(db_path)
+    migrated.init_schema()
+    assert "signature_policies" in migrated.list_tables()
+    migrated.close()
+
+
+def test_gc_expired_reclaims_free_pages(tmp_path: Path, fixed_now: datetime) -> None:
+    """GC で削除した分の空きページがファイルから回収されることを検証する。"""
+    store = StateStore(str(tmp_path / "vacuum.db"))
+    store.init_schema()
+    for index in range(200):
+        store.save_auth_session(
+            AuthSessionRecord(
+                session_id=f"auth-{index}",
+                user_email="user@example.com",
+                bw_session_key="k" * 512,
+                created_at=fixed_now - timedelta(minutes=10),
+                expires_at=fixed_now - timedelta(minutes=1),
+                last_activity=fixed_now - timedelta(minutes=5),
+            )
+        )
+
+    removed = store.gc_expired(now=fixed_now)
+
+    assert removed["auth_sessions"] == 200
     with store._connect() as conn:
-        rows = conn.execute("PRAGMA table_info(remote_servers)").fetchall()
-    columns = {row["name"] for row in rows}
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2  # INCREMENTAL
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    store.close()
+
+
+def test_remote_servers_table_schema(schema_snapshot: Dict[str, _TableSchema]) -> None:
+    """remote_servers テーブルのスキーマが期待通りであることを検証する。"""
+    table = schema_snapshot["remote_servers"]
     expected_columns = {
         "server_id",
         "catalog_item_id",
@@ -122,21 +242,13 @@ def test_remote_servers_table_schema(store: StateStore) -> None:
         "created_at",
     }
 
-    assert expected_columns.issubset(columns)
-    pk_columns = [row["name"] for row in rows if row["pk"]]
-    assert pk_columns == ["server_id"]
+    assert expected_columns.issubset(table.columns)
+    assert table.pk == ("server_id",)
 
 
-def test_oauth_states_table_schema(store: StateStore) -> None:
+def test_oauth_states_table_schema(schema_snapshot: Dict[str, _TableSchema]) -> None:
     """oauth_states テーブルのスキーマとインデックスを検証する。"""
-    with store._connect() as conn:
-        rows = conn.execute("PRAGMA table_info(oauth_states)").fetchall()
-        indexes = conn.execute("PRAGMA index_list('oauth_states')").fetchall()
-        index_info = conn.execute(
-            "PRAGMA index_info('idx_oauth_states_expires_at')"
-        ).fetchall()
-
-    columns = {row["name"] for row in rows}
+    table = schema_snapshot["oauth_states"]
     expected_columns = {
         "state",
         "server_id",
@@ -151,17 +263,29 @@ def test_oauth_states_table_schema(store: StateStore) -> None:
         "created_at",
     }
 
-    assert expected_columns.issubset(columns)
-    pk_columns = [row["name"] for row in rows if row["pk"]]
-    assert pk_columns == ["state"]
-    index_names = {row["name"] for row in indexes}
-    assert "idx_oauth_states_expires_at" in index_names
-    assert any(info["name"] == "expires_at" for info in index_info)
+    assert expected_columns.issubset(table.columns)
+    assert table.pk == ("state",)
+    assert "expires_at" in table.indexes["idx_oauth_states_expires_at"]
 
 
-def test_oauth_state_roundtrip(store: StateStore) -> None:
+def test_gc_columns_are_indexed(store: StateStore) -> None:
+    """gc_expired の削除条件が索引を使った範囲検索になることを検証する。"""
+    queries = [
+        "DELETE FROM credentials WHERE expires_at < ?",
+        "DELETE FROM sessions WHERE idle_deadline < ?",
+        "DELETE FROM jobs WHERE COALESCE(finished_at, queued_at) < ?",
+        "DELETE FROM auth_sessions WHERE expires_at < ?",
+        "DELETE FROM oauth_states WHERE expires_at < ?",
+    ]
+    with store._connect() as conn:
+        for query in queries:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {query}", ("x",)).fetchall()
+            assert any("INDEX" in row["detail"] for row in plan), query
+
+
+def test_oauth_state_roundtrip(store: StateStore, fixed_now: datetime) -> None:
     """oauth_states が保存・取得・削除できることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     record = OAuthStateRecord(
         state="state-123",
         server_id="srv-1",
@@ -193,9 +317,9 @@ def test_oauth_state_roundtrip(store: StateStore) -> None:
     assert store.get_oauth_state("state-123") is None
 
 
-def test_credential_gc(store: StateStore) -> None:
+def test_credential_gc(store: StateStore, fixed_now: datetime) -> None:
     """期限切れクレデンシャルが 30 日後に GC されることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     expired = CredentialRecord(
         credential_key="old",
         token_ref={"type": "encrypted", "key": "k1"},
@@ -226,9 +350,9 @@ def test_credential_gc(store: StateStore) -> None:
     assert fetched.scopes == ["scope:a", "scope:b"]
 
 
-def test_session_gc_by_idle_deadline(store: StateStore) -> None:
+def test_session_gc_by_idle_deadline(store: StateStore, fixed_now: datetime) -> None:
     """アイドル期限切れのセッションのみ GC されることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     expired = SessionRecord(
         session_id="s-expired",
         server_id="srv",
@@ -263,9 +387,9 @@ def test_session_gc_by_idle_deadline(store: StateStore) -> None:
     assert store.get_session("s-active") is not None
 
 
-def test_auth_session_gc_by_expires_at(store: StateStore) -> None:
+def test_auth_session_gc_by_expires_at(store: StateStore, fixed_now: datetime) -> None:
     """期限切れの認証セッションが GC されることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     expired = AuthSessionRecord(
         session_id="auth-expired",
         user_email="user@example.com",
@@ -292,56 +416,51 @@ def test_auth_session_gc_by_expires_at(store: StateStore) -> None:
     assert store.get_auth_session("auth-active") is not None
 
 
-def test_oauth_states_gc(store: StateStore) -> None:
+def test_oauth_states_gc(store: StateStore, fixed_now: datetime) -> None:
     """expires_at を過ぎた oauth_states レコードが GC されることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     expired_at = now - timedelta(minutes=1)
     valid_at = now + timedelta(minutes=10)
 
-    with store._connect() as conn:
-        conn.execute(
-            """
-            INSERT INTO oauth_states (
-                state, server_id, code_challenge, code_challenge_method, scopes,
-                authorize_url, token_url, client_id, redirect_uri, expires_at, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                "state-expired",
-                "server-1",
-                "challenge",
-                "S256",
-                json.dumps(["scope:a"]),
-                "https://auth.example.com/authorize",
-                "https://auth.example.com/token",
-                "client-123",
-                "https://app.example.com/callback",
-                expired_at.isoformat(),
-                (now - timedelta(minutes=5)).isoformat(),
-            ),
-        )
-        conn.execute(
+    rows = [
+        (
+            "state-expired",
+            "server-1",
+            "challenge",
+            "S256",
+            json.dumps(["scope:a"]),
+            "https://auth.example.com/authorize",
+            "https://auth.example.com/token",
+            "client-123",
+            "https://app.example.com/callback",
+            expired_at.isoformat(),
+            (now - timedelta(minutes=5)).isoformat(),
+        ),
+        (
+            "state-valid",
+            "server-2",
+            "challenge2",
+            "S256",
+            json.dumps(["scope:b"]),
+            "https://auth.example.com/authorize",
+            "https://auth.example.com/token",
+            "client-456",
+            "https://app.example.com/callback",
+            valid_at.isoformat(),
+            (now - timedelta(minutes=2)).isoformat(),
+        ),
+    ]
+    # executemany の全行を 1 つの明示トランザクションでまとめて書き込む
+    with store._transaction() as conn:  # type: ignore[attr-defined]
+        conn.executemany(
             """
             INSERT INTO oauth_states (
                 state, server_id, code_challenge, code_challenge_method, scopes,
                 authorize_url, token_url, client_id, redirect_uri, expires_at, created_at
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                "state-valid",
-                "server-2",
-                "challenge2",
-                "S256",
-                json.dumps(["scope:b"]),
-                "https://auth.example.com/authorize",
-                "https://auth.example.com/token",
-                "client-456",
-                "https://app.example.com/callback",
-                valid_at.isoformat(),
-                (now - timedelta(minutes=2)).isoformat(),
-            ),
+            rows,
         )
-        conn.commit()
 
     removed = store.gc_expired(now=now)
 
@@ -353,9 +472,9 @@ def test_oauth_states_gc(store: StateStore) -> None:
     assert "state-valid" in remaining_states
 
 
-def test_auth_session_roundtrip(store: StateStore) -> None:
+def test_auth_session_roundtrip(store: StateStore, fixed_now: datetime) -> None:
     """ログインセッションが保存・取得・削除できることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     record = AuthSessionRecord(
         session_id="auth-1",
         user_email="user@example.com",
@@ -379,9 +498,9 @@ def test_auth_session_roundtrip(store: StateStore) -> None:
     assert store.get_auth_session("auth-1") is None
 
 
-def test_job_gc_after_24_hours(store: StateStore) -> None:
+def test_job_gc_after_24_hours(store: StateStore, fixed_now: datetime) -> None:
     """ジョブが 24 時間後に GC されることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     old_job = JobRecord(
         job_id="job-old",
         session_id="s1",
@@ -418,9 +537,9 @@ def test_job_gc_after_24_hours(store: StateStore) -> None:
     assert store.get_job("job-new") is not None
 
 
-def test_signature_policy_roundtrip(store: StateStore) -> None:
+def test_signature_policy_roundtrip(store: StateStore, fixed_now: datetime) -> None:
     """署名ポリシーが保存・取得できることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     policy = SignaturePolicyRecord(
         server_id="srv",
         payload={
@@ -439,9 +558,9 @@ def test_signature_policy_roundtrip(store: StateStore) -> None:
     assert fetched.payload["verify_signatures"] is True
 
 
-def test_gateway_allowlist_roundtrip(store: StateStore) -> None:
+def test_gateway_allowlist_roundtrip(store: StateStore, fixed_now: datetime) -> None:
     """許可リストが保存・取得できることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     entry = GatewayAllowEntry(
         id="gw1",
         type="domain",
@@ -458,60 +577,82 @@ def test_gateway_allowlist_roundtrip(store: StateStore) -> None:
     assert entries[0].value == "example.com"
 
 
-def test_is_endpoint_allowed_exact_match_and_default_port(
-    store: StateStore, monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_is_endpoint_allowed_exact_match_and_default_port(store: StateStore) -> None:
     """ドメイン単位の許可がデフォルトポートのみ許可することを検証する。"""
-    monkeypatch.setenv("REMOTE_MCP_ALLOWED_DOMAINS", "api.example.com")
+    allowlist = "api.example.com"
 
-    assert store.is_endpoint_allowed("https://api.example.com/sse") is True
+    assert store.is_endpoint_allowed("https://api.example.com/sse", allowlist=allowlist)
     # ポート指定なしの許可は標準ポートのみ許可する
-    assert store.is_endpoint_allowed("https://api.example.com:8443/sse") is False
+    assert not store.is_endpoint_allowed("https://api.example.com:8443/sse", allowlist=allowlist)
 
 
-def test_is_endpoint_allowed_port_specific(
-    store: StateStore, monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_is_endpoint_allowed_port_specific(store: StateStore) -> None:
     """ポート番号を含む許可リストが厳密にマッチすることを検証する。"""
-    monkeypatch.setenv("REMOTE_MCP_ALLOWED_DOMAINS", "api.example.com:8443")
+    allowlist = "api.example.com:8443"
 
-    assert store.is_endpoint_allowed("https://api.example.com:8443/sse") is True
-    assert store.is_endpoint_allowed("https://api.example.com:8080/sse") is False
+    assert store.is_endpoint_allowed("https://api.example.com:8443/sse", allowlist=allowlist)
+    assert not store.is_endpoint_allowed("https://api.example.com:8080/sse", allowlist=allowlist)
 
 
-def test_is_endpoint_allowed_wildcard_subdomain(
-    store: StateStore, monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_is_endpoint_allowed_rejects_port_zero_entry(store: StateStore) -> None:
+    """ポート 0 のエントリは無効として扱い、標準ポートの許可に読み替えない。"""
+    allowlist = "api.example.com:0"
+
+    assert not store.is_endpoint_allowed("https://api.example.com/sse", allowlist=allowlist)
+    assert not store.is_endpoint_allowed("http://api.example.com/sse", allowlist=allowlist)
+
+
+def test_is_endpoint_allowed_wildcard_subdomain(store: StateStore) -> None:
     """ワイルドカードがサブドメインのみにマッチすることを検証する。"""
-    monkeypatch.setenv("REMOTE_MCP_ALLOWED_DOMAINS", "*.example.com")
+    allowlist = "*.example.com"
 
-    assert store.is_endpoint_allowed("https://api.example.com/sse") is True
-    assert store.is_endpoint_allowed("https://v2.api.example.com/sse") is True
+    assert store.is_endpoint_allowed("https://api.example.com/sse", allowlist=allowlist) is True
+    assert store.is_endpoint_allowed("https://v2.api.example.com/sse", allowlist=allowlist) is True
     # ルートドメインはワイルドカードにマッチしない
-    assert store.is_endpoint_allowed("https://example.com/sse") is False
+    assert store.is_endpoint_allowed("https://example.com/sse", allowlist=allowlist) is False
 
 
-def test_is_endpoint_allowed_ipv6_is_rejected(
-    store: StateStore, monkeypatch: pytest.MonkeyPatch
-) -> None:
+def test_is_endpoint_allowed_matches_among_many_entries(store: StateStore) -> None:
+    """多数のエントリとポート付きワイルドカードが混在しても正しく照合されることを検証する。"""
+    allowlist = ",".join(
+        [f"host-{index}.example.org" for index in range(500)]
+        + ["*.internal.example.com:8443", " API.Example.NET "]
+    )
+
+    assert store.is_endpoint_allowed("https://host-499.example.org/sse", allowlist=allowlist)
+    assert store.is_endpoint_allowed("https://a.b.internal.example.com:8443/", allowlist=allowlist)
+    assert not store.is_endpoint_allowed("https://a.internal.example.com/", allowlist=allowlist)
+    assert store.is_endpoint_allowed("http://api.example.net/sse", allowlist=allowlist)
+    assert not store.is_endpoint_allowed("https://host-500.example.org/sse", allowlist=allowlist)
+
+
+def test_is_endpoint_allowed_ipv6_is_rejected(store: StateStore) -> None:
     """IPv6 リテラルは許可リストに含まれていても拒否されることを検証する。"""
-    monkeypatch.setenv("REMOTE_MCP_ALLOWED_DOMAINS", "2001:db8::1")
+    allowlist = "2001:db8::1"
 
-    assert store.is_endpoint_allowed("https://[2001:db8::1]/sse") is False
+    assert store.is_endpoint_allowed("https://[2001:db8::1]/sse", allowlist=allowlist) is False
 
 
-def test_is_endpoint_allowed_empty_allowlist_denies_all(
+def test_is_endpoint_allowed_empty_allowlist_denies_all(store: StateStore) -> None:
+    """許可リストが空の場合はすべて拒否されることを検証する。"""
+    allowlist = ""
+
+    assert store.is_endpoint_allowed("https://api.example.com/sse", allowlist=allowlist) is False
+
+
+def test_is_endpoint_allowed_reads_env_when_allowlist_omitted(
     store: StateStore, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    """許可リストが空の場合はすべて拒否されることを検証する。"""
-    monkeypatch.setenv("REMOTE_MCP_ALLOWED_DOMAINS", "")
+    """allowlist 未指定時は REMOTE_MCP_ALLOWED_DOMAINS を参照することを検証する。"""
+    monkeypatch.setenv("REMOTE_MCP_ALLOWED_DOMAINS", "api.example.com")
 
-    assert store.is_endpoint_allowed("https://api.example.com/sse") is False
+    assert store.is_endpoint_allowed("https://api.example.com/sse") is True
+    assert store.is_endpoint_allowed("https://other.example.com/sse") is False
 
 
-def test_audit_log_sanitizes_tokens(store: StateStore) -> None:
+def test_audit_log_sanitizes_tokens(store: StateStore, fixed_now: datetime) -> None:
     """監査ログにトークン値が残らないようにマスクされることを検証する。"""
-    now = datetime.now(timezone.utc)
+    now = fixed_now
     store.record_audit_log(
         category="oauth",
         action="token_saved",
@@ -533,3 +674,43 @@ def test_audit_log_sanitizes_tokens(store: StateStore) -> None:
     assert metadata["refresh_token"] == "***redacted***"
     assert metadata["credential_key"] == "***redacted***"
     assert metadata["message"] == "ok"
+
+
+def test_transaction_rolls_back_on_error(store: StateStore) -> None:
+    """_transaction 内で例外が起きた場合は書き込みがロールバックされる。"""
+    conn = store._connect()  # type: ignore[attr-defined]
+    assert conn.isolation_level is None
+
+    with pytest.raises(RuntimeError):
+        with store._transaction() as tx:  # type: ignore[attr-defined]
+            tx.execute(
+                "INSERT INTO auth_sessions VALUES (?, ?, ?, ?, ?, ?)",
+                ("rolled-back", "user@example.com", "key", "t0", "t1", "t0"),
+            )
+            raise RuntimeError("boom")
+
+    assert not conn.in_transaction
+    rows = conn.execute("SELECT 1 FROM auth_sessions WHERE session_id = ?", ("rolled-back",))
+    assert rows.fetchone() is None
+
+
+def test_transaction_rolls_back_when_commit_fails(store: StateStore) -> None:
+    """COMMIT 自体が失敗してもトランザクションを残さず、次の書き込みを開始できる。"""
+    conn = store._connect()  # type: ignore[attr-defined]
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with store._transaction() as tx:  # type: ignore[attr-defined]
+            # 外部キー検査を COMMIT 時まで遅延させ、COMMIT を失敗させる
+            tx.execute("PRAGMA defer_foreign_keys = ON")
+            tx.execute(
+                "INSERT INTO remote_servers "
+                "(server_id, catalog_item_id, name, endpoint, status, credential_key, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ("dangling", "cat", "name", "https://example.com", "registered", "missing", "t0"),
+            )
+
+    assert not conn.in_transaction
+    assert store.get_remote_server("dangling") is None
+
+    with store._transaction() as tx:  # type: ignore[attr-defined]
+        tx.execute("SELECT 1")
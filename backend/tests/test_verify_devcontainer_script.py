@@ -3,28 +3,71 @@ from __future__ import annotations
 import os
 import stat
 import subprocess
-import textwrap
 from pathlib import Path
 
+import pytest
 
-def _repo_root() -> Path:
-    return Path(__file__).resolve().parents[2]
+from tests.script_helpers import REPO_ROOT, failure_message, write_executable
 
 
 def test_verify_devcontainer_script_exists_and_is_executable() -> None:
-    script = _repo_root() / "scripts" / "verify-devcontainer.sh"
-    assert script.exists(), "Missing scripts/verify-devcontainer.sh"
-    mode = script.stat().st_mode
+    script = REPO_ROOT / "scripts" / "verify-devcontainer.sh"
+    try:
+        mode = os.stat(script).st_mode
+    except FileNotFoundError:
+        raise AssertionError("Missing scripts/verify-devcontainer.sh") from None
+    assert stat.S_ISREG(mode), "scripts/verify-devcontainer.sh must be a regular file"
     assert mode & stat.S_IXUSR, "scripts/verify-devcontainer.sh must be executable"
 
 
-def _write_executable(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
-    path.chmod(path.stat().st_mode | stat.S_IXUSR)
-
-
-def test_verify_devcontainer_script_passes_with_fake_tools(tmp_path: Path) -> None:
-    repo_root = tmp_path
+_FAKE_TOOLS: dict[str, bytes] = {
+    "python": b"#!/usr/bin/env sh\n" b'echo "Python 3.14.2"\n',
+    "node": b"#!/usr/bin/env sh\n" b'echo "v22.21.1"\n',
+    "pip": (
+        b"#!/usr/bin/env sh\n"
+        b"cat <<'EOF'\n"
+        b"Package    Version\n"
+        b"---------- -------\n"
+        b"fastapi    0.115.6\n"
+        b"pydantic   2.10.4\n"
+        b"uvicorn    0.27.1\n"
+        b"EOF\n"
+    ),
+    "npm": (
+        b"#!/usr/bin/env sh\n"
+        b"if [ \"$1\" = \"list\" ]; then\n"
+        b"  exit 0\n"
+        b"fi\n"
+        b"exit 0\n"
+    ),
+    "code": (
+        b"#!/usr/bin/env sh\n"
+        b"if [ \"$1\" = \"--list-extensions\" ]; then\n"
+        b"  cat <<'EOF'\n"
+        b"ms-python.python\n"
+        b"ms-python.vscode-pylance\n"
+        b"charliermarsh.ruff\n"
+        b"dbaeumer.vscode-eslint\n"
+        b"esbenp.prettier-vscode\n"
+        b"bradlc.vscode-tailwindcss\n"
+        b"EOF\n"
+        b"  exit 0\n"
+        b"fi\n"
+        b"exit 0\n"
+    ),
+}
+
+
+@pytest.fixture(scope="session")
+def fake_tools_bin(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Tool stubs are read-only for the tests, so build them once per session.
+    fake_bin = tmp_path_factory.mktemp("fake_bin")
+    for name, content in _FAKE_TOOLS.items():
+        write_executable(fake_bin / name, content)
+    return fake_bin
+
+
+def _prepare_repo(repo_root: Path) -> None:
     (repo_root / "backend").mkdir()
     (repo_root / "frontend").mkdir()
     (repo_root / ".devcontainer").mkdir()
@@ -32,61 +75,23 @@ def test_verify_devcontainer_script_passes_with_fake_tools(tmp_path: Path) -> No
     # Marker written by postCreateCommand wrapper.
     (repo_root / ".devcontainer" / ".post-create.status").write_text("0\n", encoding="utf-8")
 
-    fake_bin = tmp_path / "bin"
-    fake_bin.mkdir()
 
-    _write_executable(
-        fake_bin / "python",
-        "#!/usr/bin/env sh\n"
-        'echo "Python 3.14.2"\n',
-    )
-    _write_executable(
-        fake_bin / "node",
-        "#!/usr/bin/env sh\n"
-        'echo "v22.21.1"\n',
-    )
-    _write_executable(
-        fake_bin / "pip",
-        "#!/usr/bin/env sh\n"
-        "cat <<'EOF'\n"
-        "Package    Version\n"
-        "---------- -------\n"
-        "fastapi    0.115.6\n"
-        "pydantic   2.10.4\n"
-        "uvicorn    0.27.1\n"
-        "EOF\n",
-    )
-    _write_executable(
-        fake_bin / "npm",
-        "#!/usr/bin/env sh\n"
-        "if [ \"$1\" = \"list\" ]; then\n"
-        "  exit 0\n"
-        "fi\n"
-        "exit 0\n",
-    )
-    _write_executable(
-        fake_bin / "code",
-        "#!/usr/bin/env sh\n"
-        "if [ \"$1\" = \"--list-extensions\" ]; then\n"
-        "  cat <<'EOF'\n"
-        "ms-python.python\n"
-        "ms-python.vscode-pylance\n"
-        "charliermarsh.ruff\n"
-        "dbaeumer.vscode-eslint\n"
-        "esbenp.prettier-vscode\n"
-        "bradlc.vscode-tailwindcss\n"
-        "EOF\n"
-        "  exit 0\n"
-        "fi\n"
-        "exit 0\n",
-    )
+def _env_with_path(*bin_dirs: Path) -> dict[str, str]:
+    env = os.environ.copy()
+    env["PATH"] = os.pathsep.join([*map(str, bin_dirs), env.get("PATH", "")])
+    return env
 
-    script_under_test = _repo_root() / "scripts" / "verify-devcontainer.sh"
-    assert script_under_test.exists(), "Missing scripts/verify-devcontainer.sh in repo"
 
-    env = os.environ.copy()
-    env["PATH"] = f"{fake_bin}{os.pathsep}{env.get('PATH','')}"
+def test_verify_devcontainer_script_passes_with_fake_tools(
+    tmp_path: Path, fake_tools_bin: Path
+) -> None:
+    repo_root = tmp_path
+    _prepare_repo(repo_root)
+
+    script_under_test = REPO_ROOT / "scripts" / "verify-devcontainer.sh"
+    assert script_under_test.exists(), "Missing scripts/verify-devcontainer.sh in repo"
 
+    env = _env_with_path(fake_tools_bin)
     env["VERIFY_DEVCONTAINER_SKIP_EXTENSIONS"] = "1"
 
     result = subprocess.run(
@@ -94,74 +99,37 @@ def test_verify_devcontainer_script_passes_with_fake_tools(tmp_path: Path) -> No
         cwd=repo_root,
         env=env,
         capture_output=True,
-        text=True,
         check=False,
     )
-    assert result.returncode == 0, textwrap.dedent(
-        f"""
-        Expected success but got exit code {result.returncode}
-        --- stdout ---
-        {result.stdout}
-        --- stderr ---
-        {result.stderr}
-        """
-    )
+    if result.returncode != 0:
+        raise AssertionError(failure_message(result))
 
 
-def test_verify_devcontainer_script_fails_on_wrong_python_version(tmp_path: Path) -> None:
+def test_verify_devcontainer_script_fails_on_wrong_python_version(
+    tmp_path: Path, fake_tools_bin: Path
+) -> None:
     repo_root = tmp_path
-    (repo_root / "backend").mkdir()
-    (repo_root / "frontend").mkdir()
-    (repo_root / ".devcontainer").mkdir()
-    (repo_root / ".devcontainer" / ".post-create.status").write_text("0\n", encoding="utf-8")
-
-    fake_bin = tmp_path / "bin"
-    fake_bin.mkdir()
-
-    _write_executable(
-        fake_bin / "python",
-        "#!/usr/bin/env sh\n"
-        'echo "Python 3.13.9"\n',
-    )
-    _write_executable(
-        fake_bin / "node",
-        "#!/usr/bin/env sh\n"
-        'echo "v22.21.1"\n',
-    )
-    _write_executable(
-        fake_bin / "pip",
-        "#!/usr/bin/env sh\n"
-        "cat <<'EOF'\n"
-        "Package    Version\n"
-        "---------- -------\n"
-        "fastapi    0.115.6\n"
-        "pydantic   2.10.4\n"
-        "uvicorn    0.27.1\n"
-        "EOF\n",
-    )
-    _write_executable(
-        fake_bin / "npm",
-        "#!/usr/bin/env sh\n"
-        "exit 0\n",
-    )
-    _write_executable(
-        fake_bin / "code",
-        "#!/usr/bin/env sh\n"
-        "exit 0\n",
+    _prepare_repo(repo_root)
+
+    # Overlay only the python stub; the rest come from the shared fake_tools_bin.
+    overlay_bin = tmp_path / "bin"
+    overlay_bin.mkdir()
+    write_executable(
+        overlay_bin / "python",
+        b"#!/usr/bin/env sh\n"
+        b'echo "Python 3.13.9"\n',
     )
 
-    script_under_test = _repo_root() / "scripts" / "verify-devcontainer.sh"
+    script_under_test = REPO_ROOT / "scripts" / "verify-devcontainer.sh"
 
-    env = os.environ.copy()
-    env["PATH"] = f"{fake_bin}{os.pathsep}{env.get('PATH','')}"
+    env = _env_with_path(overlay_bin, fake_tools_bin)
 
     result = subprocess.run(
         ["bash", str(script_under_test)],
         cwd=repo_root,
         env=env,
         capture_output=True,
-        text=True,
         check=False,
     )
     assert result.returncode != 0
-    assert "Python 3.14" in (result.stdout + result.stderr)
+    assert b"Python 3.14" in result.stdout + result.stderr
@@ -6,81 +6,85 @@ import subprocess
 import textwrap
 from pathlib import Path
 
+from tests.script_helpers import REPO_ROOT, failure_message, write_executable
+
+_FAKE_DOCKER_TEMPLATE = textwrap.dedent(
+    """\
+    #!/usr/bin/env bash
+    set -euo pipefail
+
+    echo "$@" >> "{log}"
+
+    # Handle docker --host unix:///path ps
+    if [[ "${{1:-}}" == "--host" ]] || [[ "${{1:-}}" == --host=* ]]; then
+      host_arg="${{1:-}}"
+      shift || true
+      host_value="${{host_arg#--host=}}"
+      if [ "$host_arg" = "--host" ]; then
+        host_value="${{1:-}}"
+        shift || true
+      fi
+      echo "host:${{host_value}}:${{*}}" >> "{exec_log}"
+      exit 0
+    fi
+
+    if [ "${{1:-}}" != "compose" ]; then
+      exit 0
+    fi
+
+    shift
+    compose_file="unknown"
+    if [ "${{1:-}}" = "-f" ]; then
+      compose_file="${{2:-}}"
+      shift 2 || true
+    fi
+
+    action="${{1:-}}"
+    if [ "$action" = "exec" ]; then
+      shift
+      if [ "${{1:-}}" = "-T" ]; then
+        shift
+      fi
+      service="${{1:-}}"
+      shift || true
+      cmd="${{1:-}}"
+      shift || true
+      echo "exec:${{compose_file}}:${{service}}:${{cmd}}:${{*}}" >> "{exec_log}"
+
+      if [ "$service" = "backend" ] && [ "$cmd" = "curl" ]; then
+        if [ "${{FAIL_HEALTH:-0}}" = "1" ]; then
+          echo "unhealthy"
+        else
+          echo '{{"status":"ok"}}'
+        fi
+        exit 0
+      fi
 
-def _repo_root() -> Path:
-    return Path(__file__).resolve().parents[2]
+      if [ "$service" = "frontend" ] && [ "$cmd" = "curl" ]; then
+        echo '{{"api":"ok"}}'
+        exit 0
+      fi
 
+      exit 0
+    fi
 
-def _write_executable(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
-    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    exit 0
+    """
+)
 
 
 def _write_fake_docker(path: Path, log_path: Path, exec_log_path: Path) -> None:
-    content = textwrap.dedent(
-        f"""\
-        #!/usr/bin/env bash
-        set -euo pipefail
-
-        echo "$@" >> "{log_path}"
-
-        # Handle docker --host unix:///path ps
-        if [[ "${{1:-}}" == "--host" ]] || [[ "${{1:-}}" == --host=* ]]; then
-          host_arg="${{1:-}}"
-          shift || true
-          host_value="${{host_arg#--host=}}"
-          if [ "$host_arg" = "--host" ]; then
-            host_value="${{1:-}}"
-            shift || true
-          fi
-          echo "host:${{host_value}}:${{*}}" >> "{exec_log_path}"
-          exit 0
-        fi
+    content = _FAKE_DOCKER_TEMPLATE.format(log=log_path, exec_log=exec_log_path)
+    write_executable(path, content)
 
-        if [ "${{1:-}}" != "compose" ]; then
-          exit 0
-        fi
 
-        shift
-        compose_file="unknown"
-        if [ "${{1:-}}" = "-f" ]; then
-          compose_file="${{2:-}}"
-          shift 2 || true
-        fi
-
-        action="${{1:-}}"
-        if [ "$action" = "exec" ]; then
-          shift
-          if [ "${{1:-}}" = "-T" ]; then
-            shift
-          fi
-          service="${{1:-}}"
-          shift || true
-          cmd="${{1:-}}"
-          shift || true
-          echo "exec:${{compose_file}}:${{service}}:${{cmd}}:${{*}}" >> "{exec_log_path}"
-
-          if [ "$service" = "backend" ] && [ "$cmd" = "curl" ]; then
-            if [ "${{FAIL_HEALTH:-0}}" = "1" ]; then
-              echo "unhealthy"
-            else
-              echo '{{"status":"ok"}}'
-            fi
-            exit 0
-          fi
-
-          if [ "$service" = "frontend" ] && [ "$cmd" = "curl" ]; then
-            echo '{{"api":"ok"}}'
-            exit 0
-          fi
-
-          exit 0
-        fi
-
-        exit 0
-        """
-    )
-    _write_executable(path, content)
+_INIT_SOCKET_TEMPLATE = textwrap.dedent(
+    """\
+    #!/usr/bin/env sh
+    set -eu
+    printf 'DOCKER_SOCKET=%s\\n' "{socket}"
+    """
+)
 
 
 def _prepare_repo(tmp_path: Path, socket_path: Path) -> None:
@@ -99,22 +103,16 @@ def _prepare_repo(tmp_path: Path, socket_path: Path) -> None:
     )
 
     init_script = devcontainer_dir / "init-docker-socket.sh"
-    _write_executable(
-        init_script,
-        textwrap.dedent(
-            f"""\
-            #!/usr/bin/env sh
-            set -eu
-            printf 'DOCKER_SOCKET=%s\\n' "{socket_path}"
-            """
-        ),
-    )
+    write_executable(init_script, _INIT_SOCKET_TEMPLATE.format(socket=socket_path))
 
 
 def test_verify_integration_script_exists_and_executable() -> None:
-    script = _repo_root() / "scripts" / "verify-integration.sh"
-    assert script.exists(), "Missing scripts/verify-integration.sh"
-    mode = script.stat().st_mode
+    script = REPO_ROOT / "scripts" / "verify-integration.sh"
+    try:
+        mode = os.stat(script).st_mode
+    except FileNotFoundError:
+        raise AssertionError("Missing scripts/verify-integration.sh") from None
+    assert stat.S_ISREG(mode), "scripts/verify-integration.sh must be a regular file"
     assert mode & stat.S_IXUSR, "scripts/verify-integration.sh must be executable"
 
 
@@ -136,25 +134,17 @@ def test_verify_integration_script_runs_checks_with_socket_detection(tmp_path: P
     env["DOCKER_SOCKET_ALLOW_REGULAR_FILE"] = "1"
     env["CI"] = "true"
 
-    script_under_test = _repo_root() / "scripts" / "verify-integration.sh"
+    script_under_test = REPO_ROOT / "scripts" / "verify-integration.sh"
     result = subprocess.run(
         ["bash", str(script_under_test)],
         cwd=tmp_path,
         env=env,
         capture_output=True,
-        text=True,
         check=False,
     )
 
-    assert result.returncode == 0, textwrap.dedent(
-        f"""
-        Expected success but got exit code {result.returncode}
-        --- stdout ---
-        {result.stdout}
-        --- stderr ---
-        {result.stderr}
-        """
-    )
+    if result.returncode != 0:
+        raise AssertionError(failure_message(result))
 
     exec_calls = exec_log_path.read_text(encoding="utf-8").splitlines()
     assert any("backend:curl" in line and "docker-compose" in line for line in exec_calls), "backend health check not invoked"
@@ -182,16 +172,15 @@ def test_verify_integration_script_fails_on_unhealthy_backend(tmp_path: Path) ->
     env["FAIL_HEALTH"] = "1"
     env["CI"] = "true"
 
-    script_under_test = _repo_root() / "scripts" / "verify-integration.sh"
+    script_under_test = REPO_ROOT / "scripts" / "verify-integration.sh"
     result = subprocess.run(
         ["bash", str(script_under_test)],
         cwd=tmp_path,
         env=env,
         capture_output=True,
-        text=True,
         check=False,
     )
 
     assert result.returncode != 0
-    combined_output = f"{result.stdout}\n{result.stderr}"
-    assert "health" in combined_output.lower()
+    combined_output = result.stdout + b"\n" + result.stderr
+    assert b"health" in combined_output.lower()
@@ -1,29 +1,78 @@
 from __future__ import annotations
 
 import json
-import re
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from packaging import version
 
+
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
-    return Path(__file__).resolve().parents[2]
+    # __file__ is already absolute for imported modules and the repo does not symlink tests,
+    # so lexical parents are enough (no realpath walk).
+    return Path(__file__).parents[2]
+
+
+@lru_cache(maxsize=None)
+def _dir_index(directory: str) -> Dict[str, os.DirEntry[str]]:
+    # One scandir per directory replaces a stat() per probed file.
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        return {}
+
+
+def _dir_entry(path: Path) -> Optional[os.DirEntry[str]]:
+    return _dir_index(str(path.parent)).get(path.name)
+
+
+@lru_cache(maxsize=None)
+def _read_bytes(path: str) -> bytes:
+    return Path(path).read_bytes()
+
+
+@lru_cache(maxsize=None)
+def _read_text(path: str) -> str:
+    return Path(path).read_text(encoding="utf-8")
 
 
+@lru_cache(maxsize=None)
+def _load_json(path: str) -> Any:
+    return json.loads(_read_text(path))
+
+
+def _lock_packages() -> Dict[str, Any]:
+    """Return the ``packages`` map of package-lock.json (parsed once via ``_load_json``)."""
+    lock_data = _load_json(str(_repo_root() / "frontend" / "package-lock.json"))
+    packages = lock_data.get("packages")
+    assert isinstance(packages, dict), "package-lock.json must contain a packages map"
+    return packages
+
+
+_REQUIRED_KEYS = ("python", "node", "next", "react")
+
+
+# Both tests load the manifest; parse and validate it once. Callers must not mutate the result.
+@lru_cache(maxsize=1)
 def _load_manifest() -> Dict[str, str]:
     manifest = _repo_root() / ".kiro" / "specs" / "tech-stack-devcontainer" / "version-manifest.json"
-    assert manifest.exists(), "Missing version-manifest.json for tech-stack-devcontainer"
-
-    data = json.loads(manifest.read_text(encoding="utf-8"))
-    required_keys = {"python", "node", "next", "react"}
-    missing = required_keys.difference(data.keys())
-    assert not missing, f"Manifest is missing keys: {sorted(missing)}"
+    assert _dir_entry(manifest) is not None, (
+        "Missing version-manifest.json for tech-stack-devcontainer"
+    )
 
+    data = _load_json(str(manifest))
     pins: Dict[str, str] = {}
-    for key in required_keys:
+    for key in _REQUIRED_KEYS:
+        assert key in data, f"Manifest is missing key: {key}"
         value = str(data[key])
-        assert re.match(r"^\d+\.\d+\.\d+$", value), f"{key} version must be pinned to patch level (got {value})"
+        parts = value.split(".")
+        assert len(parts) == 3 and all(part.isdigit() for part in parts), (
+            f"{key} version must be pinned to patch level (got {value})"
+        )
         pins[key] = value
 
     assert pins["python"].startswith("3.14."), "python pin must be for the 3.14.x line"
@@ -47,49 +96,59 @@ def test_versions_are_consistent_across_repo_files() -> None:
     repo = _repo_root()
 
     python_image = f"python:{pins['python']}-slim"
+    python_image_bytes = python_image.encode("ascii")
     for dockerfile in (
         repo / ".devcontainer" / "Dockerfile.workspace",
         repo / "backend" / "Dockerfile",
         repo / "backend" / "Dockerfile.dev",
     ):
-        assert dockerfile.exists(), f"Missing {dockerfile}"
-        text = dockerfile.read_text(encoding="utf-8")
-        assert python_image in text, f"{dockerfile} must pin {python_image}"
+        assert _dir_entry(dockerfile) is not None, f"Missing {dockerfile}"
+        data = _read_bytes(str(dockerfile))
+        assert python_image_bytes in data, f"{dockerfile} must pin {python_image}"
 
     node_image = f"node:{pins['node']}-alpine"
+    node_image_bytes = node_image.encode("ascii")
     for dockerfile in (
         repo / "frontend" / "Dockerfile",
     ):
-        assert dockerfile.exists(), f"Missing {dockerfile}"
-        text = dockerfile.read_text(encoding="utf-8")
-        assert node_image in text, f"{dockerfile} must pin {node_image}"
+        assert _dir_entry(dockerfile) is not None, f"Missing {dockerfile}"
+        data = _read_bytes(str(dockerfile))
+        assert node_image_bytes in data, f"{dockerfile} must pin {node_image}"
 
     node_dev_image = f"node:{pins['node']}-bookworm"
+    node_dev_image_bytes = node_dev_image.encode("ascii")
     for dockerfile in (
         repo / "frontend" / "Dockerfile.dev",
     ):
-        assert dockerfile.exists(), f"Missing {dockerfile}"
-        text = dockerfile.read_text(encoding="utf-8")
-        assert node_dev_image in text, f"{dockerfile} must pin {node_dev_image}"
+        assert _dir_entry(dockerfile) is not None, f"Missing {dockerfile}"
+        data = _read_bytes(str(dockerfile))
+        assert node_dev_image_bytes in data, f"{dockerfile} must pin {node_dev_image}"
 
     pkg_json_path = repo / "frontend" / "package.json"
-    assert pkg_json_path.exists(), "Missing frontend/package.json"
-    pkg_json = json.loads(pkg_json_path.read_text(encoding="utf-8"))
+    assert _dir_entry(pkg_json_path) is not None, "Missing frontend/package.json"
+    pkg_json = _load_json(str(pkg_json_path))
     dependencies: Dict[str, Any] = pkg_json.get("dependencies", {})
     assert dependencies.get("next") == pins["next"], "package.json next version must match manifest"
     assert dependencies.get("react") == pins["react"], "package.json react version must match manifest"
     assert dependencies.get("react-dom") == pins["react"], "package.json react-dom version must match manifest"
 
     requirements = repo / "backend" / "requirements.txt"
-    assert requirements.exists(), "backend/requirements.txt must be committed"
-    assert requirements.stat().st_size > 0, "backend/requirements.txt must not be empty"
+    requirements_entry = _dir_entry(requirements)
+    assert requirements_entry is not None, "backend/requirements.txt must be committed"
+    assert requirements_entry.stat().st_size > 0, "backend/requirements.txt must not be empty"
 
     package_lock = repo / "frontend" / "package-lock.json"
-    assert package_lock.exists(), "frontend/package-lock.json must be committed"
-    assert package_lock.stat().st_size > 0, "frontend/package-lock.json must not be empty"
+    package_lock_entry = _dir_entry(package_lock)
+    assert package_lock_entry is not None, "frontend/package-lock.json must be committed"
+    assert package_lock_entry.stat().st_size > 0, "frontend/package-lock.json must not be empty"
+
+    # Cheap literal scan first so a stale lock fails before any entry is decoded.
+    next_pin = f'"next": "{pins["next"]}"'
+    assert next_pin in _read_text(str(package_lock)), (
+        "package-lock.json must pin next to manifest version"
+    )
 
-    lock_data = json.loads(package_lock.read_text(encoding="utf-8"))
-    lock_packages: Dict[str, Any] = lock_data.get("packages", {})
+    lock_packages = _lock_packages()
     root_package = lock_packages.get("", {})
     root_deps: Dict[str, Any] = root_package.get("dependencies", {})
     assert root_deps.get("next") == pins["next"], "package-lock root dependencies must pin next to manifest version"
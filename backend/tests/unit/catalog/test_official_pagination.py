@@ -1,6 +1,11 @@
 """Tests for Official Registry pagination logic."""
 
-import time
+import asyncio
+import contextlib
+import re
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import NamedTuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -10,10 +15,20 @@ from app.models.catalog import CatalogErrorCode
 from app.services.catalog import CatalogError, CatalogService
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def catalog_service():
-    """Create a CatalogService instance for testing."""
-    return CatalogService()
+    """Create one CatalogService for the module; per-test state is reset by ``reset_warning``."""
+    service = CatalogService()
+    # URL 検証は対象外のため、入力をそのまま返すスタブを 1 度だけ差し込む
+    service._url_validator = MagicMock()
+    service._url_validator.validate.side_effect = lambda url: url
+    return service
+
+
+@pytest.fixture(autouse=True)
+def reset_warning(catalog_service):
+    """Clear the warning left by a previous test on the shared service."""
+    catalog_service._warning_var.set(None)
 
 
 @pytest.fixture
@@ -24,9 +39,28 @@ def mock_settings():
         mock.catalog_official_max_pages = 20
         mock.catalog_official_fetch_timeout = 60
         mock.catalog_official_page_delay = 100
+        mock.catalog_official_fetch_attempts = 1
         yield mock
 
 
+@pytest.fixture(scope="module")
+def shared_client():
+    """Module-wide stand-in for the httpx client; per-test state is reset by ``mock_get``."""
+    client = MagicMock()
+    client.get = AsyncMock()
+    return client
+
+
+@pytest.fixture
+def mock_get(shared_client, monkeypatch):
+    """Route httpx.AsyncClient to the shared client and return its (reset) ``get`` mock."""
+    shared_client.get.reset_mock(return_value=True, side_effect=True)
+    client_context = MagicMock()
+    client_context.__aenter__.return_value = shared_client
+    monkeypatch.setattr("httpx.AsyncClient", lambda *args, **kwargs: client_context)
+    return shared_client.get
+
+
 def create_mock_response(servers: list, next_cursor: str | None = None) -> dict:
     """Create a mock Official Registry response."""
     response = {
@@ -58,168 +92,212 @@ def create_mock_server(name: str, index: int) -> dict:
     }
 
 
-class TestFetchOfficialRegistryWithPagination:
-    """Tests for _fetch_official_registry_with_pagination method."""
+def fake_response(payload: dict) -> SimpleNamespace:
+    """Minimal successful response; the pagination loop only calls json() and raise_for_status()."""
+    return SimpleNamespace(
+        status_code=200,
+        json=lambda: payload,
+        raise_for_status=lambda: None,
+    )
 
-    @pytest.mark.asyncio
-    async def test_single_page_no_cursor(self, catalog_service, mock_settings):
-        """Test fetching a single page with no nextCursor."""
-        # Task 2: 初回リクエストをカーソルなしで発行する
-        servers = [create_mock_server("test", i) for i in range(30)]
-        mock_response = create_mock_response(servers)
-
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                mock_get.return_value.status_code = 200
-                mock_get.return_value.json.return_value = mock_response
-                mock_get.return_value.raise_for_status = MagicMock()
-                mock_client.get = mock_get
-
-                # This should work after implementation
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
-
-                # Verify single request without cursor
-                assert mock_get.call_count == 1
-                assert len(result) == 30
 
-    @pytest.mark.asyncio
-    async def test_multiple_pages_with_cursor(self, catalog_service, mock_settings):
-        """Test fetching multiple pages with nextCursor."""
-        # Task 2: カーソルが存在する場合、次ページを取得する
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-        page2_servers = [create_mock_server("page2", i) for i in range(30)]
-        page3_servers = [create_mock_server("page3", i) for i in range(30)]
+class SleepStub:
+    """Counting stand-in for asyncio.sleep that records only what the tests assert on."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last: float | None = None
+
+    async def __call__(self, delay: float) -> None:
+        self.count += 1
+        self.last = delay
+
+
+@lru_cache(maxsize=None)
+def mock_page(name: str, size: int) -> tuple[dict, ...]:
+    """Build ``size`` mock servers once per (name, size); the service only reads them."""
+    return tuple(create_mock_server(name, i) for i in range(size))
 
-        responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
-            create_mock_response(page2_servers, "cursor-page3"),
-            create_mock_response(page3_servers),  # Last page, no cursor
-        ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+@lru_cache(maxsize=64)
+def mock_page_response(name: str, size: int, next_cursor: str | None = None) -> dict:
+    """Cached Official Registry response for ``mock_page(name, size)``; treat it as read-only."""
+    return create_mock_response(list(mock_page(name, size)), next_cursor)
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
 
-                mock_get = AsyncMock()
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=resp),
-                        raise_for_status=MagicMock()
-                    )
-                    for resp in responses
-                ]
-                mock_client.get = mock_get
+CURSOR_RE = re.compile(r"cursor=cursor-page(\d+)")
 
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
 
-                # Verify three requests with correct cursors
-                assert mock_get.call_count == 3
+class _PaginationCase(NamedTuple):
+    num_pages: int
+    max_pages: int
+    fetch_timeout: int
+    expected_calls: int
+    expected_len: int
+    expected_warning: str | None
+    # time.monotonic() の戻り値列（開始時刻 + 各ページ取得前）。None なら実時計を使う
+    clock: tuple[float, ...] | None = None
 
-                # Check first request (no cursor)
-                first_call_url = mock_get.call_args_list[0][0][0]
-                assert "cursor=" not in first_call_url
 
-                # Check second request (with cursor-page2)
-                second_call_url = mock_get.call_args_list[1][0][0]
-                assert "cursor=cursor-page2" in second_call_url
+class TestFetchOfficialRegistryWithPagination:
+    """Tests for _fetch_official_registry_with_pagination method."""
 
-                # Check third request (with cursor-page3)
-                third_call_url = mock_get.call_args_list[2][0][0]
-                assert "cursor=cursor-page3" in third_call_url
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "case",
+        [
+            # Task 2: 初回リクエストをカーソルなしで発行する
+            _PaginationCase(1, 20, 60, 1, 30, None),
+            # Task 2: カーソルが存在する場合、次ページを取得する
+            _PaginationCase(3, 20, 60, 3, 90, None),
+            # Task 5: max_pages に達したら打ち切って警告する
+            _PaginationCase(3, 2, 60, 2, 60, "Max pages (2) reached"),
+            # Task 5: 上限内で全ページ取得できた場合は警告なし
+            _PaginationCase(2, 10, 60, 2, 60, None),
+            # Task 6: 期限 (10s) の直前に最終ページを取得しても警告なし
+            _PaginationCase(2, 20, 10, 2, 60, None, clock=(0, 0.5, 9.9)),
+        ],
+        ids=[
+            "single_page_no_cursor",
+            "multiple_pages_with_cursor",
+            "max_pages_reached",
+            "no_warning_when_all_pages_fetched",
+            "no_timeout_within_limit",
+        ],
+    )
+    async def test_pagination_matrix(self, catalog_service, mock_settings, mock_get, case):
+        """Test page count, cursors, item totals and warnings across pagination limits."""
+        mock_settings.catalog_official_max_pages = case.max_pages
+        mock_settings.catalog_official_fetch_timeout = case.fetch_timeout
 
-                # Verify all servers are combined (90 total)
-                assert len(result) == 90
+        responses = [
+            mock_page_response(
+                f"page{page}", 30, f"cursor-page{page + 1}" if page < case.num_pages else None
+            )
+            for page in range(1, case.num_pages + 1)
+        ]
+        mock_get.side_effect = (fake_response(resp) for resp in responses)
+
+        with contextlib.ExitStack() as stack:
+            if case.clock is not None:
+                mock_time = stack.enter_context(patch("app.services.catalog.time"))
+                mock_time.monotonic.side_effect = list(case.clock)
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+        # Snapshot the requested URLs once instead of re-walking call_args_list per assertion
+        urls = [call.args[0] for call in mock_get.call_args_list]
+        assert len(urls) == case.expected_calls
+        # First request has no cursor; each later one carries the previous page's nextCursor
+        assert "cursor=" not in urls[0]
+        cursors = CURSOR_RE.findall("\n".join(urls))
+        assert cursors == [str(page) for page in range(2, case.expected_calls + 1)]
+
+        assert len(result) == case.expected_len
+        if case.expected_warning is None:
+            assert catalog_service.warning is None
+        else:
+            assert catalog_service.warning is not None
+            assert case.expected_warning in catalog_service.warning
 
     @pytest.mark.asyncio
-    async def test_page_delay(self, catalog_service, mock_settings):
+    async def test_cursor_is_url_encoded(self, catalog_service, mock_settings, mock_get):
+        """Test that the cursor is encoded and merged into an existing query string."""
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "io.github/x:1.0 a+b")),
+            fake_response(mock_page_response("page2", 30)),
+        ]
+
+        with patch("asyncio.sleep", SleepStub()):
+            await catalog_service._fetch_official_registry_with_pagination(
+                f"{mock_settings.catalog_official_url}?limit=30"
+            )
+
+        second_call_url = mock_get.call_args_list[1].args[0]
+        assert second_call_url.count("?") == 1
+        assert "limit=30" in second_call_url
+        assert "cursor=io.github%2Fx%3A1.0%20a%2Bb" in second_call_url
+
+    @pytest.mark.asyncio
+    async def test_page_delay(self, catalog_service, mock_settings, mock_get):
         """Test page delay between requests."""
         # Task 3: 各ページ取得後に遅延を挿入する
         mock_settings.catalog_official_page_delay = 100  # 100ms
 
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-        page2_servers = [create_mock_server("page2", i) for i in range(30)]
-
         responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
-            create_mock_response(page2_servers),  # Last page
+            mock_page_response("page1", 30, "cursor-page2"),
+            mock_page_response("page2", 30),  # Last page
         ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=resp),
-                        raise_for_status=MagicMock()
-                    )
-                    for resp in responses
-                ]
-                mock_client.get = mock_get
-
-                with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-                    result = await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
-
-                    # Verify sleep was called once (after page 1, before page 2)
-                    assert mock_sleep.call_count == 1
-                    # Verify sleep duration is 0.1 seconds (100ms)
-                    mock_sleep.assert_called_with(0.1)
-
-                    # Verify all servers are returned
-                    assert len(result) == 60
+        mock_get.side_effect = (fake_response(resp) for resp in responses)
+
+        with patch("asyncio.sleep", SleepStub()) as mock_sleep, \
+             patch("app.services.catalog.time") as mock_time:
+            # Freeze the clock so no response time is deducted from the delay
+            mock_time.monotonic.return_value = 0
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+            # Verify sleep was called once (after page 1, before page 2)
+            assert mock_sleep.count == 1
+            # Verify sleep duration is 0.1 seconds (100ms)
+            assert mock_sleep.last == 0.1
+
+            # Verify all servers are returned
+            assert len(result) == 60
 
     @pytest.mark.asyncio
-    async def test_no_delay_on_last_page(self, catalog_service, mock_settings):
-        """Test that delay is skipped on the last page."""
-        # Task 3: 最終ページ(カーソルなし)の場合は遅延をスキップする
-        servers = [create_mock_server("test", i) for i in range(30)]
-        mock_response = create_mock_response(servers)  # No cursor
+    @pytest.mark.parametrize(
+        ("page1_elapsed", "expected_sleep"),
+        [(0.04, 0.06), (0.25, None)],
+        ids=["fast_response_waits_remainder", "slow_response_skips_delay"],
+    )
+    async def test_page_delay_deducts_response_time(
+        self, catalog_service, mock_settings, mock_get, page1_elapsed, expected_sleep
+    ):
+        """Test that time spent on the previous request counts toward the page delay."""
+        mock_settings.catalog_official_page_delay = 100
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "cursor-page2")),
+            fake_response(mock_page_response("page2", 30)),
+        ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+        with patch("asyncio.sleep", SleepStub()) as mock_sleep, \
+             patch("app.services.catalog.time") as mock_time:
+            # deadline base, before page 1, before page 2
+            mock_time.monotonic.side_effect = [0, 0, page1_elapsed]
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+        if expected_sleep is None:
+            assert mock_sleep.count == 0
+        else:
+            assert mock_sleep.count == 1
+            assert mock_sleep.last == pytest.approx(expected_sleep)
+        assert len(result) == 60
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
+    @pytest.mark.asyncio
+    async def test_no_delay_on_last_page(self, catalog_service, mock_settings, mock_get):
+        """Test that delay is skipped on the last page."""
+        # Task 3: 最終ページ(カーソルなし)の場合は遅延をスキップする
+        mock_response = mock_page_response("test", 30)  # No cursor
 
-                mock_get = AsyncMock()
-                mock_get.return_value.status_code = 200
-                mock_get.return_value.json.return_value = mock_response
-                mock_get.return_value.raise_for_status = MagicMock()
-                mock_client.get = mock_get
+        mock_get.return_value = fake_response(mock_response)
 
-                with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-                    result = await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
+        with patch("asyncio.sleep", SleepStub()) as mock_sleep:
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
 
-                    # Verify no sleep on last page
-                    assert mock_sleep.call_count == 0
-                    assert len(result) == 30
+            # Verify no sleep on last page
+            assert mock_sleep.count == 0
+            assert len(result) == 30
 
     @pytest.mark.asyncio
-    async def test_duplicate_id_collision_handling(self, catalog_service, mock_settings):
+    async def test_duplicate_id_collision_handling(self, catalog_service, mock_settings, mock_get):
         """Test that duplicate server names are filtered out."""
         # 重複したサーバー名を除外する
         # Create pages with some duplicate servers
@@ -239,488 +317,310 @@ class TestFetchOfficialRegistryWithPagination:
             create_mock_response(page2_servers),
         ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+        mock_get.side_effect = (fake_response(resp) for resp in responses)
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
+        result = await catalog_service._fetch_official_registry_with_pagination(
+            mock_settings.catalog_official_url
+        )
 
-                mock_get = AsyncMock()
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=resp),
-                        raise_for_status=MagicMock()
-                    )
-                    for resp in responses
-                ]
-                mock_client.get = mock_get
+        # Verify duplicate names are filtered out (test-2 from page 2 is excluded)
+        assert len(result) == 5
 
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
-
-                # Verify duplicate names are filtered out (test-2 from page 2 is excluded)
-                assert len(result) == 5
-
-                # Verify all unique IDs are present (duplicate test-2 from page 2 is filtered out)
-                result_ids = sorted([item.id for item in result])
-                expected_ids = sorted(["test-1", "test-2", "test-3", "test-4", "test-5"])
-                assert result_ids == expected_ids
+        # Verify all unique IDs are present (duplicate test-2 from page 2 is filtered out)
+        result_ids = sorted([item.id for item in result])
+        expected_ids = sorted(["test-1", "test-2", "test-3", "test-4", "test-5"])
+        assert result_ids == expected_ids
 
 
 class TestMaxPagesLimit:
     """Tests for maximum pages limit (Task 5)."""
 
     @pytest.mark.asyncio
-    async def test_max_pages_reached(self, catalog_service, mock_settings):
-        """Test that pagination stops after reaching max_pages."""
-        # Set max_pages to 2
-        mock_settings.catalog_official_max_pages = 2
-
-        # Create 3 pages of data
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-        page2_servers = [create_mock_server("page2", i) for i in range(30)]
-        page3_servers = [create_mock_server("page3", i) for i in range(30)]
-
-        responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
-            create_mock_response(page2_servers, "cursor-page3"),
-            create_mock_response(page3_servers),  # This should not be fetched
-        ]
-
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=resp),
-                        raise_for_status=MagicMock()
-                    )
-                    for resp in responses
-                ]
-                mock_client.get = mock_get
-
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
-
-                # Verify only 2 pages were fetched
-                assert mock_get.call_count == 2
-
-                # Verify warning message was set
-                assert catalog_service.warning is not None
-                assert "Max pages (2) reached" in catalog_service.warning
-
-                # Verify 60 items returned (2 pages * 30 items)
-                assert len(result) == 60
-
-    @pytest.mark.asyncio
-    async def test_max_pages_warning_message(self, catalog_service, mock_settings):
+    async def test_max_pages_warning_message(self, catalog_service, mock_settings, mock_get):
         """Test warning message content when max pages reached."""
         mock_settings.catalog_official_max_pages = 1
 
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
         responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
+            mock_page_response("page1", 30, "cursor-page2"),
         ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=resp),
-                        raise_for_status=MagicMock()
-                    )
-                    for resp in responses
-                ]
-                mock_client.get = mock_get
-
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
-
-                # Verify result contains expected items from first page
-                assert isinstance(result, list)
-                assert len(result) == 30  # Only first page (max_pages=1)
-
-                # Verify warning contains expected information
-                warning = catalog_service.warning
-                assert warning is not None
-                assert "Max pages (1) reached" in warning
-                assert "Returning 30 items" in warning
-                assert "More items may be available" in warning
-
-    @pytest.mark.asyncio
-    async def test_no_warning_when_all_pages_fetched(self, catalog_service, mock_settings):
-        """Test no warning when all pages are fetched within limit."""
-        mock_settings.catalog_official_max_pages = 10
-
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-        page2_servers = [create_mock_server("page2", i) for i in range(30)]
+        mock_get.side_effect = (fake_response(resp) for resp in responses)
 
-        responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
-            create_mock_response(page2_servers),  # Last page, no cursor
-        ]
+        result = await catalog_service._fetch_official_registry_with_pagination(
+            mock_settings.catalog_official_url
+        )
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+        # Verify result contains expected items from first page
+        assert isinstance(result, list)
+        assert len(result) == 30  # Only first page (max_pages=1)
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
+        # Verify warning contains expected information
+        warning = catalog_service.warning
+        assert warning is not None
+        assert "Max pages (1) reached" in warning
+        assert "Returning 30 items" in warning
+        assert "More items may be available" in warning
 
-                mock_get = AsyncMock()
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=resp),
-                        raise_for_status=MagicMock()
-                    )
-                    for resp in responses
-                ]
-                mock_client.get = mock_get
-
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
+    @pytest.mark.asyncio
+    async def test_no_delay_after_last_allowed_page(
+        self, catalog_service, mock_settings, mock_get
+    ):
+        """Test that no page delay is spent once max_pages has been fetched."""
+        mock_settings.catalog_official_max_pages = 2
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "cursor-page2")),
+            fake_response(mock_page_response("page2", 30, "cursor-page3")),
+        ]
 
-                # Verify no warning when all pages fetched
-                assert catalog_service.warning is None
+        with patch("asyncio.sleep", SleepStub()) as mock_sleep:
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
 
-                # Verify all items returned
-                assert len(result) == 60
+        # Only the delay between page 1 and page 2; none after the capped final page
+        assert mock_sleep.count == 1
+        assert mock_get.call_count == 2
+        assert len(result) == 60
+        assert "Max pages (2) reached" in catalog_service.warning
 
 
 class TestTimeout:
     """Tests for overall timeout (Task 6)."""
 
     @pytest.mark.asyncio
-    async def test_timeout_reached(self, catalog_service, mock_settings):
+    async def test_timeout_reached(self, catalog_service, mock_settings, mock_get):
         """Test that pagination stops when timeout is reached."""
         # Set short timeout (1 second)
         mock_settings.catalog_official_fetch_timeout = 1
 
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-        page2_servers = [create_mock_server("page2", i) for i in range(30)]
-
         responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
-            create_mock_response(page2_servers, "cursor-page3"),
+            mock_page_response("page1", 30, "cursor-page2"),
+            mock_page_response("page2", 30, "cursor-page3"),
         ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+        # Mock time to simulate timeout
+        with patch("app.services.catalog.time") as mock_time:
+            # Start time: 0, after page 1: 0.5, after page 2: 1.5 (exceeds timeout)
+            mock_time.monotonic.side_effect = [0, 0.5, 1.5]
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
+            mock_get.side_effect = (fake_response(resp) for resp in responses)
 
-                # Mock time to simulate timeout
-                with patch("time.time") as mock_time:
-                    # Start time: 0, after page 1: 0.5, after page 2: 1.5 (exceeds timeout)
-                    mock_time.side_effect = [0, 0.5, 1.5]
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
 
-                    mock_get = AsyncMock()
-                    mock_get.side_effect = [
-                        MagicMock(
-                            status_code=200,
-                            json=MagicMock(return_value=resp),
-                            raise_for_status=MagicMock()
-                        )
-                        for resp in responses
-                    ]
-                    mock_client.get = mock_get
+            # Verify only 1 page was fetched (timeout before page 2)
+            assert mock_get.call_count == 1
 
-                    result = await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
+            # Verify warning message was set
+            assert catalog_service.warning is not None
+            assert "Timeout reached" in catalog_service.warning
+            assert "after 1 pages" in catalog_service.warning
 
-                    # Verify only 1 page was fetched (timeout before page 2)
-                    assert mock_get.call_count == 1
-
-                    # Verify warning message was set
-                    assert catalog_service.warning is not None
-                    assert "Timeout reached" in catalog_service.warning
-                    assert "after 1 pages" in catalog_service.warning
-
-                    # Verify partial data returned (30 items from page 1)
-                    assert len(result) == 30
+            # Verify partial data returned (30 items from page 1)
+            assert len(result) == 30
 
     @pytest.mark.asyncio
-    async def test_timeout_warning_message(self, catalog_service, mock_settings):
+    async def test_timeout_warning_message(self, catalog_service, mock_settings, mock_get):
         """Test warning message content when timeout is reached."""
         mock_settings.catalog_official_fetch_timeout = 1
 
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
         responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
+            mock_page_response("page1", 30, "cursor-page2"),
         ]
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                with patch("time.time") as mock_time:
-                    # Start time: 0, check after page 1: 0.5, check before page 2: 2.0 (timeout)
-                    mock_time.side_effect = [0, 0.5, 2.0]
-
-                    mock_get = AsyncMock()
-                    mock_get.side_effect = [
-                        MagicMock(
-                            status_code=200,
-                            json=MagicMock(return_value=resp),
-                            raise_for_status=MagicMock()
-                        )
-                        for resp in responses
-                    ]
-                    mock_client.get = mock_get
-
-                    result = await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
-
-                    # Verify result contains items from first page before timeout
-                    assert isinstance(result, list)
-                    assert len(result) == 30  # Only first page before timeout
-
-                    # Verify warning contains expected information
-                    warning = catalog_service.warning
-                    assert warning is not None
-                    assert "Timeout reached" in warning
-                    assert "Returning 30 items" in warning
+        with patch("app.services.catalog.time") as mock_time:
+            # Start time: 0, check after page 1: 0.5, check before page 2: 2.0 (timeout)
+            mock_time.monotonic.side_effect = [0, 0.5, 2.0]
 
-    @pytest.mark.asyncio
-    async def test_no_timeout_within_limit(self, catalog_service, mock_settings):
-        """Test no timeout when all pages fetched within time limit."""
-        mock_settings.catalog_official_fetch_timeout = 10
+            mock_get.side_effect = (fake_response(resp) for resp in responses)
 
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-        page2_servers = [create_mock_server("page2", i) for i in range(30)]
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
 
-        responses = [
-            create_mock_response(page1_servers, "cursor-page2"),
-            create_mock_response(page2_servers),
-        ]
+            # Verify result contains items from first page before timeout
+            assert isinstance(result, list)
+            assert len(result) == 30  # Only first page before timeout
+
+            # Verify warning contains expected information
+            warning = catalog_service.warning
+            assert warning is not None
+            assert "Timeout reached" in warning
+            assert "Returning 30 items" in warning
 
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+    @pytest.mark.asyncio
+    async def test_hung_page_is_cut_off_by_remaining_budget(
+        self, catalog_service, mock_settings, mock_get
+    ):
+        """Test that a page that never answers is abandoned when the overall budget runs out."""
+        mock_settings.catalog_official_fetch_timeout = 0.2
+        mock_settings.catalog_official_page_delay = 0
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
+        first_page = fake_response(mock_page_response("page1", 30, "cursor-page2"))
 
-                with patch("time.time") as mock_time:
-                    mock_time.side_effect = [0, 0.5, 1.0]  # Within timeout
+        async def get(url, **kwargs):
+            if "cursor=" not in url:
+                return first_page
+            await asyncio.Event().wait()  # 2 ページ目は応答しない
 
-                    mock_get = AsyncMock()
-                    mock_get.side_effect = [
-                        MagicMock(
-                            status_code=200,
-                            json=MagicMock(return_value=resp),
-                            raise_for_status=MagicMock()
-                        )
-                        for resp in responses
-                    ]
-                    mock_client.get = mock_get
+        mock_get.side_effect = get
 
-                    result = await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
+        result = await catalog_service._fetch_official_registry_with_pagination(
+            mock_settings.catalog_official_url
+        )
 
-                    # Verify all pages fetched
-                    assert mock_get.call_count == 2
-                    assert catalog_service.warning is None
-                    assert len(result) == 60
+        assert len(result) == 30
+        warning = catalog_service.warning
+        assert warning is not None
+        assert "Timeout reached while fetching page 2" in warning
+        assert "Returning 30 items" in warning
 
 
 class TestErrorHandling:
     """Tests for error handling (Task 7)."""
 
     @pytest.mark.asyncio
-    async def test_initial_page_failure(self, catalog_service, mock_settings):
+    async def test_initial_page_failure(self, catalog_service, mock_settings, mock_get):
         """Test that CatalogError is raised when initial page fetch fails."""
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
+        # Simulate network error on first request
+        mock_get.side_effect = httpx.ConnectError("Connection failed")
+
+        # Verify CatalogError is raised
+        with pytest.raises(CatalogError) as exc_info:
+            await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+        assert exc_info.value.error_code == CatalogErrorCode.UPSTREAM_UNAVAILABLE
+
+    @pytest.mark.asyncio
+    async def test_subsequent_page_failure_returns_partial_data(
+        self, catalog_service, mock_settings, mock_get
+    ):
+        """Test that partial data is returned when subsequent page fetch fails."""
 
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
+        # First page succeeds, second page fails
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "cursor-page2")),
+            httpx.ConnectError("Connection failed on page 2")
+        ]
 
-                mock_get = AsyncMock()
-                # Simulate network error on first request
-                mock_get.side_effect = httpx.ConnectError("Connection failed")
-                mock_client.get = mock_get
+        result = await catalog_service._fetch_official_registry_with_pagination(
+            mock_settings.catalog_official_url
+        )
 
-                # Verify CatalogError is raised
-                with pytest.raises(CatalogError) as exc_info:
-                    await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
+        # Verify partial data returned (30 items from page 1)
+        assert len(result) == 30
 
-                assert exc_info.value.error_code == CatalogErrorCode.UPSTREAM_UNAVAILABLE
+        # Verify warning message was set
+        assert catalog_service.warning is not None
+        assert "Error fetching page 2" in catalog_service.warning
+        assert "Returning 30 items" in catalog_service.warning
 
     @pytest.mark.asyncio
-    async def test_subsequent_page_failure_returns_partial_data(self, catalog_service, mock_settings):
-        """Test that partial data is returned when subsequent page fetch fails."""
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                # First page succeeds, second page fails
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=create_mock_response(page1_servers, "cursor-page2")),
-                        raise_for_status=MagicMock()
-                    ),
-                    httpx.ConnectError("Connection failed on page 2")
-                ]
-                mock_client.get = mock_get
-
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
-
-                # Verify partial data returned (30 items from page 1)
-                assert len(result) == 30
-
-                # Verify warning message was set
-                assert catalog_service.warning is not None
-                assert "Error fetching page 2" in catalog_service.warning
-                assert "Returning 30 items" in catalog_service.warning
+    async def test_transient_page_failure_is_retried(
+        self, catalog_service, mock_settings, mock_get
+    ):
+        """Test that a 5xx on a later page is retried after a jittered backoff."""
+        mock_settings.catalog_official_fetch_attempts = 2
+        unavailable = MagicMock()
+        unavailable.status_code = 503
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "cursor-page2")),
+            httpx.HTTPStatusError("Unavailable", request=MagicMock(), response=unavailable),
+            fake_response(mock_page_response("page2", 30)),
+        ]
+        sleep = SleepStub()
+
+        with patch("asyncio.sleep", sleep), \
+             patch("app.services.catalog.time") as mock_time, \
+             patch("app.services.catalog.random.uniform", return_value=0.075) as uniform:
+            mock_time.monotonic.return_value = 0
+            result = await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+        assert len(result) == 60
+        assert mock_get.call_count == 3
+        assert catalog_service.warning is None
+        # ページ間ディレイ 1 回 + バックオフ 1 回。バックオフはページ間ディレイ (0.1s) を基準にジッターを掛ける
+        assert sleep.count == 2
+        uniform.assert_called_once_with(0.05, 0.1)
+        assert sleep.last == 0.075
 
     @pytest.mark.asyncio
-    async def test_rate_limit_429_without_partial_data(self, catalog_service, mock_settings):
+    async def test_rate_limit_429_without_partial_data(
+        self, catalog_service, mock_settings, mock_get
+    ):
         """Test that 429 error is raised when rate limited on initial page."""
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                # Simulate 429 rate limit on first request
-                mock_response = MagicMock()
-                mock_response.status_code = 429
-                mock_response.headers = {"Retry-After": "60"}
-                mock_get.side_effect = httpx.HTTPStatusError(
-                    "Rate limited",
-                    request=MagicMock(),
-                    response=mock_response
-                )
-                mock_client.get = mock_get
-
-                # Verify CatalogError with RATE_LIMITED is raised
-                with pytest.raises(CatalogError) as exc_info:
-                    await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
-
-                assert exc_info.value.error_code == CatalogErrorCode.RATE_LIMITED
-                assert exc_info.value.retry_after_seconds == 60
+        # Simulate 429 rate limit on first request
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "60"}
+        mock_get.side_effect = httpx.HTTPStatusError(
+            "Rate limited",
+            request=MagicMock(),
+            response=mock_response
+        )
+
+        # Verify CatalogError with RATE_LIMITED is raised
+        with pytest.raises(CatalogError) as exc_info:
+            await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+        assert exc_info.value.error_code == CatalogErrorCode.RATE_LIMITED
+        assert exc_info.value.retry_after_seconds == 60
 
     @pytest.mark.asyncio
-    async def test_rate_limit_429_with_partial_data(self, catalog_service, mock_settings):
+    async def test_rate_limit_429_with_partial_data(self, catalog_service, mock_settings, mock_get):
         """Test that 429 error is raised even when partial data exists."""
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                # First page succeeds, second page rate limited
-                mock_response = MagicMock()
-                mock_response.status_code = 429
-                mock_response.headers = {"Retry-After": "60"}
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=create_mock_response(page1_servers, "cursor-page2")),
-                        raise_for_status=MagicMock()
-                    ),
-                    httpx.HTTPStatusError(
-                        "Rate limited",
-                        request=MagicMock(),
-                        response=mock_response
-                    )
-                ]
-                mock_client.get = mock_get
-
-                # Verify CatalogError with RATE_LIMITED is raised
-                with pytest.raises(CatalogError) as exc_info:
-                    await catalog_service._fetch_official_registry_with_pagination(
-                        mock_settings.catalog_official_url
-                    )
-
-                assert exc_info.value.error_code == CatalogErrorCode.RATE_LIMITED
+
+        # First page succeeds, second page rate limited
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "60"}
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "cursor-page2")),
+            httpx.HTTPStatusError(
+                "Rate limited",
+                request=MagicMock(),
+                response=mock_response
+            )
+        ]
+
+        # Verify CatalogError with RATE_LIMITED is raised
+        with pytest.raises(CatalogError) as exc_info:
+            await catalog_service._fetch_official_registry_with_pagination(
+                mock_settings.catalog_official_url
+            )
+
+        assert exc_info.value.error_code == CatalogErrorCode.RATE_LIMITED
 
     @pytest.mark.asyncio
-    async def test_http_error_with_partial_data(self, catalog_service, mock_settings):
+    async def test_http_error_with_partial_data(self, catalog_service, mock_settings, mock_get):
         """Test partial success with HTTP error on subsequent page."""
-        page1_servers = [create_mock_server("page1", i) for i in range(30)]
-
-        with patch.object(catalog_service, "_url_validator") as mock_validator:
-            mock_validator.validate.return_value = mock_settings.catalog_official_url
-
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = MagicMock()
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-
-                mock_get = AsyncMock()
-                # First page succeeds, second page returns 503
-                mock_response = MagicMock()
-                mock_response.status_code = 503
-                mock_get.side_effect = [
-                    MagicMock(
-                        status_code=200,
-                        json=MagicMock(return_value=create_mock_response(page1_servers, "cursor-page2")),
-                        raise_for_status=MagicMock()
-                    ),
-                    httpx.HTTPStatusError(
-                        "Service unavailable",
-                        request=MagicMock(),
-                        response=mock_response
-                    )
-                ]
-                mock_client.get = mock_get
-
-                result = await catalog_service._fetch_official_registry_with_pagination(
-                    mock_settings.catalog_official_url
-                )
-
-                # Verify partial data returned
-                assert len(result) == 30
-
-                # Verify warning message
-                assert catalog_service.warning is not None
-                assert "Error fetching page 2" in catalog_service.warning
+
+        # First page succeeds, second page returns 503
+        mock_response = MagicMock()
+        mock_response.status_code = 503
+        mock_get.side_effect = [
+            fake_response(mock_page_response("page1", 30, "cursor-page2")),
+            httpx.HTTPStatusError(
+                "Service unavailable",
+                request=MagicMock(),
+                response=mock_response
+            )
+        ]
+
+        result = await catalog_service._fetch_official_registry_with_pagination(
+            mock_settings.catalog_official_url
+        )
+
+        # Verify partial data returned
+        assert len(result) == 30
+
+        # Verify warning message
+        assert catalog_service.warning is not None
+        assert "Error fetching page 2" in catalog_service.warning
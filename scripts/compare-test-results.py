@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
+from bisect import bisect_left
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
@@ -12,6 +14,12 @@ from typing import Dict, Iterable, List, Tuple
 FAIL_STATUSES = {"failed", "failure", "error", "timedout", "timedOut", "broken"}
 PASS_STATUSES = {"passed", "ok", "success"}
 SKIP_STATUSES = {"skipped", "pending", "todo", "disabled", "ignored"}
+_STATUS_BUCKET = {
+    **{status: "passed" for status in PASS_STATUSES},
+    **{status: "failed" for status in FAIL_STATUSES},
+    **{status: "skipped" for status in SKIP_STATUSES},
+}
+TIMESTAMP_RE = re.compile(r"(\d{8}-\d{6})")
 
 
 def parse_args() -> argparse.Namespace:
@@ -27,25 +35,39 @@ def parse_args() -> argparse.Namespace:
 
 
 def load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json.loads(path.read_bytes())
 
 
 def find_latest_file(base: Path, prefix: str) -> Path:
-    candidates = sorted(base.glob(f"{prefix}-*.json"))
-    if not candidates:
+    head = f"{prefix}-"
+    try:
+        with os.scandir(base) as entries:
+            latest = max(
+                (entry.name for entry in entries if entry.name.startswith(head) and entry.name.endswith(".json")),
+                default=None,
+            )
+    except FileNotFoundError:
+        latest = None
+    if latest is None:
         raise FileNotFoundError(f"No artifacts found for prefix {prefix} in {base}")
-    return candidates[-1]
+    return base / latest
+
+
+def _utc_now_iso() -> str:
+    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
 def parse_timestamp_from_name(path: Path) -> str:
-    match = re.search(r"(\d{8}-\d{6})", path.name)
+    match = TIMESTAMP_RE.search(path.name)
     if not match:
-        return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+        return _utc_now_iso()
     raw = match.group(1)
     return datetime.strptime(raw, "%Y%m%d-%H%M%S").isoformat() + "Z"
 
 
 def _float_or_zero(value: object) -> float:
+    if type(value) is float:
+        return value
     if value is None:
         return 0.0
     try:
@@ -54,6 +76,15 @@ def _float_or_zero(value: object) -> float:
         return 0.0
 
 
+def _count_statuses(tests: Dict[str, Dict[str, object]]) -> Dict[str, int]:
+    counts = {"passed": 0, "failed": 0, "skipped": 0}
+    for test in tests.values():
+        bucket = _STATUS_BUCKET.get(test["status"])
+        if bucket is not None:
+            counts[bucket] += 1
+    return counts
+
+
 def load_pytest_results(path: Path) -> dict:
     data = load_json(path)
     summary = data.get("summary", {})
@@ -62,7 +93,7 @@ def load_pytest_results(path: Path) -> dict:
         nodeid = entry.get("nodeid")
         if not nodeid:
             continue
-        status = entry.get("outcome", "unknown")
+        status = sys.intern(str(entry.get("outcome", "unknown")).lower())
         duration = _float_or_zero(entry.get("duration"))
         tests[nodeid] = {"status": status, "duration": duration}
 
@@ -88,33 +119,42 @@ def load_jest_results(path: Path) -> dict:
         file_name = suite.get("name") or suite.get("testFilePath") or "suite"
         for assertion in suite.get("assertionResults", []):
             title = assertion.get("fullName") or assertion.get("title") or "test"
-            status = assertion.get("status", "unknown")
+            status = sys.intern(str(assertion.get("status", "unknown")).lower())
             duration = _float_or_zero(assertion.get("duration"))
             test_id = f"{file_name}::{title}"
             tests[test_id] = {"status": status, "duration": duration}
 
     total = data.get("numTotalTests") or len(tests)
-    passed = data.get("numPassedTests") or len([t for t in tests.values() if t["status"] in PASS_STATUSES])
-    failed = data.get("numFailedTests") or len([t for t in tests.values() if t["status"] in FAIL_STATUSES])
-    skipped = data.get("numPendingTests") or len([t for t in tests.values() if t["status"] in SKIP_STATUSES])
+    passed = data.get("numPassedTests")
+    failed = data.get("numFailedTests")
+    skipped = data.get("numPendingTests")
+    if not (passed and failed and skipped):
+        counts = _count_statuses(tests)
+        passed = passed or counts["passed"]
+        failed = failed or counts["failed"]
+        skipped = skipped or counts["skipped"]
     duration = sum(_float_or_zero(t["duration"]) for t in tests.values())
     return {"total": total, "passed": passed, "failed": failed, "skipped": skipped, "duration": duration, "tests": tests}
 
 
 def _collect_playwright_tests(suites: Iterable[dict]) -> Dict[str, Dict[str, object]]:
     collected: Dict[str, Dict[str, object]] = {}
-    for suite in suites:
+    stack = list(suites)
+    stack.reverse()
+    while stack:
+        suite = stack.pop()
         suite_title = suite.get("title") or "suite"
         for spec in suite.get("specs", []):
             spec_title = spec.get("title") or "spec"
             for test in spec.get("tests", []):
                 title = test.get("title") or "test"
-                status = test.get("status", "unknown")
+                status = sys.intern(str(test.get("status", "unknown")).lower())
                 duration = _float_or_zero(test.get("duration") or test.get("duration_ms"))
                 test_id = f"{suite_title}/{spec_title}::{title}"
                 collected[test_id] = {"status": status, "duration": duration}
-        nested = suite.get("suites") or []
-        collected.update(_collect_playwright_tests(nested))
+        nested = suite.get("suites")
+        if nested:
+            stack.extend(reversed(nested))
     return collected
 
 
@@ -122,9 +162,8 @@ def load_playwright_results(path: Path) -> dict:
     data = load_json(path)
     tests = _collect_playwright_tests(data.get("suites", []))
     total = len(tests)
-    passed = len([t for t in tests.values() if t["status"] in PASS_STATUSES])
-    failed = len([t for t in tests.values() if t["status"] in FAIL_STATUSES])
-    skipped = len([t for t in tests.values() if t["status"] in SKIP_STATUSES])
+    counts = _count_statuses(tests)
+    passed, failed, skipped = counts["passed"], counts["failed"], counts["skipped"]
     duration = sum(_float_or_zero(t["duration"]) for t in tests.values())
     if not duration and "stats" in data:
         duration = _float_or_zero(data["stats"].get("duration"))
@@ -158,26 +197,28 @@ def _percent_from_value(value: object) -> float | None:
     return None
 
 
-def parse_coverage(path: Path) -> dict:
-    data = load_json(path)
-    global_candidates = []
+def _global_coverage(data: dict) -> float | None:
+    total = 0.0
+    count = 0
     if "totals" in data:
         totals = data["totals"]
         for key in ("percent_covered", "percent_covered_display"):
-            pct = _percent_from_value(totals.get(key))
-            if pct is not None:
-                global_candidates.append(pct)
-        if "lines" in totals:
-            pct = _percent_from_value(totals["lines"].get("pct"))
-            if pct is not None:
-                global_candidates.append(pct)
-    if "total" in data and isinstance(data["total"], dict):
-        totals = data["total"]
+            if (pct := _percent_from_value(totals.get(key))) is not None:
+                total += pct
+                count += 1
+        if "lines" in totals and (pct := _percent_from_value(totals["lines"].get("pct"))) is not None:
+            total += pct
+            count += 1
+    if isinstance(totals := data.get("total"), dict):
         for metric in ("lines", "statements"):
-            if metric in totals:
-                pct = _percent_from_value(totals[metric].get("pct"))
-                if pct is not None:
-                    global_candidates.append(pct)
+            if metric in totals and (pct := _percent_from_value(totals[metric].get("pct"))) is not None:
+                total += pct
+                count += 1
+    return total / count if count else None
+
+
+def parse_coverage(path: Path) -> dict:
+    data = load_json(path)
 
     per_file: Dict[str, float] = {}
     for file_path, file_data in data.get("files", {}).items():
@@ -196,8 +237,7 @@ def parse_coverage(path: Path) -> dict:
             if pct is not None:
                 per_file[key] = pct
 
-    global_coverage = sum(global_candidates) / len(global_candidates) if global_candidates else None
-    return {"global": global_coverage, "files": per_file}
+    return {"global": _global_coverage(data), "files": per_file}
 
 
 def combine_coverages(entries: Iterable[dict]) -> dict:
@@ -230,10 +270,10 @@ def collect_artifacts(base_dir: Path) -> dict:
             continue
         timestamp_source = timestamp_source or path
         result = loader(path)
+        tests.update(result.pop("tests"))
         results.append(result)
 
-    stats, test_map = merge_results(results)
-    tests.update(test_map)
+    stats, _ = merge_results(results)
 
     coverage_entries = []
     for prefix in ("coverage-backend", "coverage-frontend"):
@@ -244,7 +284,7 @@ def collect_artifacts(base_dir: Path) -> dict:
         coverage_entries.append(parse_coverage(coverage_path))
 
     coverage = combine_coverages(coverage_entries)
-    timestamp = parse_timestamp_from_name(timestamp_source) if timestamp_source else datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    timestamp = parse_timestamp_from_name(timestamp_source) if timestamp_source else _utc_now_iso()
     return {"stats": stats, "tests": tests, "coverage": coverage, "timestamp": timestamp}
 
 
@@ -254,20 +294,21 @@ def diff_tests(baseline: Dict[str, Dict[str, object]], updated: Dict[str, Dict[s
     flaky: List[str] = []
 
     for test_id, base in baseline.items():
-        base_status = str(base.get("status", "")).lower()
-        updated_status = str(updated.get(test_id, {}).get("status", "")).lower()
+        base_status = base.get("status", "")
+        upd = updated.get(test_id)
+        updated_status = upd.get("status", "") if upd is not None else ""
 
-        if base_status in FAIL_STATUSES and updated_status not in FAIL_STATUSES:
+        base_failed = base_status in FAIL_STATUSES
+        updated_failed = updated_status in FAIL_STATUSES
+        if base_failed and not updated_failed:
             resolved.append(test_id)
-        if base_status not in FAIL_STATUSES and updated_status in FAIL_STATUSES:
+        elif updated_failed and not base_failed:
             new_failures.append(test_id)
         if updated_status and base_status and base_status != updated_status:
             flaky.append(test_id)
 
     for test_id, upd in updated.items():
-        if test_id in baseline:
-            continue
-        if str(upd.get("status", "")).lower() in FAIL_STATUSES:
+        if test_id not in baseline and upd.get("status", "") in FAIL_STATUSES:
             new_failures.append(test_id)
 
     return sorted(set(new_failures)), sorted(set(resolved)), sorted(set(flaky))
@@ -280,13 +321,18 @@ def evaluate_coverage(baseline: dict, updated: dict, critical_paths: Iterable[st
 
     critical_details: Dict[str, dict] = {}
     worst_drop = 0.0
+    base_files = baseline.get("files", {})
+    updated_files = updated.get("files", {})
+    base_paths = sorted(base_files)
     for critical in critical_paths:
-        base_candidates = {path: pct for path, pct in baseline.get("files", {}).items() if path.startswith(critical)}
-        updated_candidates = {path: pct for path, pct in updated.get("files", {}).items() if path.startswith(critical)}
-        for path, base_pct in base_candidates.items():
-            if path not in updated_candidates:
+        for index in range(bisect_left(base_paths, critical), len(base_paths)):
+            path = base_paths[index]
+            if not path.startswith(critical):
+                break
+            if path not in updated_files:
                 continue
-            updated_pct = updated_candidates[path]
+            base_pct = base_files[path]
+            updated_pct = updated_files[path]
             delta = updated_pct - base_pct
             worst_drop = min(worst_drop, delta)
             critical_details[path] = {"baseline": base_pct, "updated": updated_pct, "delta": delta}
@@ -299,23 +345,33 @@ def evaluate_coverage(baseline: dict, updated: dict, critical_paths: Iterable[st
 
 
 def build_summary(baseline: dict, updated: dict, thresholds: dict) -> dict:
+    base_stats = baseline["stats"]
+    updated_stats = updated["stats"]
+    base_coverage = baseline["coverage"]
+    updated_coverage = updated["coverage"]
+    base_duration = base_stats["duration"]
+    updated_duration = updated_stats["duration"]
+
     new_failures, resolved, flaky = diff_tests(baseline["tests"], updated["tests"])
     delta_runtime = 0.0
-    if baseline["stats"]["duration"]:
-        delta_runtime = ((updated["stats"]["duration"] - baseline["stats"]["duration"]) / baseline["stats"]["duration"]) * 100
+    if base_duration:
+        delta_runtime = ((updated_duration - base_duration) / base_duration) * 100
 
     coverage_delta, coverage_ok, critical_details = evaluate_coverage(
-        baseline["coverage"],
-        updated["coverage"],
+        base_coverage,
+        updated_coverage,
         thresholds.get("critical_paths", []),
         float(thresholds.get("coverage_drop_critical", 1.0)),
         float(thresholds.get("coverage_drop_global", 0.5)),
     )
 
+    runtime_tolerance = float(thresholds.get("runtime_tolerance_percent", 10.0))
+    max_new_failures = int(thresholds.get("max_new_failures", 0))
+    max_new_flaky = int(thresholds.get("max_new_flaky", 3))
     acceptance = {
-        "execution_time_within_threshold": abs(delta_runtime) <= float(thresholds.get("runtime_tolerance_percent", 10.0)),
-        "no_new_failures": len(new_failures) <= int(thresholds.get("max_new_failures", 0)),
-        "flaky_within_limit": len(flaky) <= int(thresholds.get("max_new_flaky", 3)),
+        "execution_time_within_threshold": abs(delta_runtime) <= runtime_tolerance,
+        "no_new_failures": len(new_failures) <= max_new_failures,
+        "flaky_within_limit": len(flaky) <= max_new_flaky,
         "coverage_within_threshold": coverage_ok,
     }
     acceptance["overall_pass"] = all(acceptance.values())
@@ -323,21 +379,21 @@ def build_summary(baseline: dict, updated: dict, thresholds: dict) -> dict:
     return {
         "baseline_timestamp": baseline["timestamp"],
         "updated_timestamp": updated["timestamp"],
-        "total_tests": {"baseline": baseline["stats"]["total"], "updated": updated["stats"]["total"]},
-        "passes": {"baseline": baseline["stats"]["passed"], "updated": updated["stats"]["passed"]},
-        "failures": {"baseline": baseline["stats"]["failed"], "updated": updated["stats"]["failed"]},
-        "skipped": {"baseline": baseline["stats"]["skipped"], "updated": updated["stats"]["skipped"]},
+        "total_tests": {"baseline": base_stats["total"], "updated": updated_stats["total"]},
+        "passes": {"baseline": base_stats["passed"], "updated": updated_stats["passed"]},
+        "failures": {"baseline": base_stats["failed"], "updated": updated_stats["failed"]},
+        "skipped": {"baseline": base_stats["skipped"], "updated": updated_stats["skipped"]},
         "new_failures": new_failures,
         "resolved_failures": resolved,
         "flaky_tests": flaky,
         "execution_time": {
-            "baseline": baseline["stats"]["duration"],
-            "updated": updated["stats"]["duration"],
+            "baseline": base_duration,
+            "updated": updated_duration,
             "delta_percent": delta_runtime,
         },
         "coverage": {
-            "baseline_global": baseline["coverage"].get("global"),
-            "updated_global": updated["coverage"].get("global"),
+            "baseline_global": base_coverage.get("global"),
+            "updated_global": updated_coverage.get("global"),
             "delta_percent": coverage_delta,
             "critical": critical_details,
         },
@@ -345,64 +401,65 @@ def build_summary(baseline: dict, updated: dict, thresholds: dict) -> dict:
     }
 
 
+def _write_if_changed(path: Path, text: str) -> None:
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+
+
 def write_summary(summary: dict, output_dir: Path) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     summary_path = output_dir / "regression-summary.json"
-    summary_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    _write_if_changed(summary_path, json.dumps(summary, indent=2, ensure_ascii=False))
 
 
 def write_report(summary: dict, output_dir: Path) -> None:
-    lines: List[str] = []
-    lines.append("# 回帰レポート / Regression Report")
-    lines.append("")
-    lines.append("## サマリー")
-    lines.append(f"- ベースライン: {summary['baseline_timestamp']}")
-    lines.append(f"- 比較対象: {summary['updated_timestamp']}")
-    lines.append(f"- 合計テスト: {summary['total_tests']['baseline']} → {summary['total_tests']['updated']}")
-    lines.append(
-        f"- 実行時間: {summary['execution_time']['baseline']:.2f}s → {summary['execution_time']['updated']:.2f}s "
-        f"(Δ {summary['execution_time']['delta_percent']:.2f}%)"
-    )
-    if summary["coverage"]["baseline_global"] is not None and summary["coverage"]["updated_global"] is not None:
+    execution = summary["execution_time"]
+    coverage = summary["coverage"]
+    acceptance = summary["acceptance"]
+    lines: List[str] = [
+        "# 回帰レポート / Regression Report",
+        "",
+        "## サマリー",
+        f"- ベースライン: {summary['baseline_timestamp']}",
+        f"- 比較対象: {summary['updated_timestamp']}",
+        f"- 合計テスト: {summary['total_tests']['baseline']} → {summary['total_tests']['updated']}",
+        f"- 実行時間: {execution['baseline']:.2f}s → {execution['updated']:.2f}s "
+        f"(Δ {execution['delta_percent']:.2f}%)",
+    ]
+    if coverage["baseline_global"] is not None and coverage["updated_global"] is not None:
         lines.append(
-            f"- カバレッジ: {summary['coverage']['baseline_global']:.2f}% → {summary['coverage']['updated_global']:.2f}% "
-            f"(Δ {summary['coverage']['delta_percent']:.2f}%)"
+            f"- カバレッジ: {coverage['baseline_global']:.2f}% → {coverage['updated_global']:.2f}% "
+            f"(Δ {coverage['delta_percent']:.2f}%)"
         )
-    lines.append(f"- 判定: {'PASS' if summary['acceptance']['overall_pass'] else 'FAIL'}")
-    lines.append("")
-
-    lines.append("## リグレッション (新規失敗)")
-    if summary["new_failures"]:
-        for item in summary["new_failures"]:
-            lines.append(f"- {item}")
-    else:
-        lines.append("- なし")
-    lines.append("")
-
-    lines.append("## 解消された失敗")
-    if summary["resolved_failures"]:
-        for item in summary["resolved_failures"]:
-            lines.append(f"- {item}")
-    else:
-        lines.append("- なし")
-    lines.append("")
-
-    lines.append("## Flaky Tests")
-    if summary["flaky_tests"]:
-        for item in summary["flaky_tests"]:
-            lines.append(f"- {item}")
-    else:
-        lines.append("- none")
-    lines.append("")
-
-    lines.append("## しきい値判定")
-    lines.append(f"- 実行時間しきい値: {summary['acceptance']['execution_time_within_threshold']}")
-    lines.append(f"- 新規失敗: {summary['acceptance']['no_new_failures']}")
-    lines.append(f"- Flaky 許容: {summary['acceptance']['flaky_within_limit']}")
-    lines.append(f"- カバレッジ低下: {summary['acceptance']['coverage_within_threshold']}")
+    lines += [f"- 判定: {'PASS' if acceptance['overall_pass'] else 'FAIL'}", ""]
+
+    for heading, items, empty in (
+        ("## リグレッション (新規失敗)", summary["new_failures"], "- なし"),
+        ("## 解消された失敗", summary["resolved_failures"], "- なし"),
+        ("## Flaky Tests", summary["flaky_tests"], "- none"),
+    ):
+        lines.append(heading)
+        if items:
+            lines.extend(f"- {item}" for item in items)
+        else:
+            lines.append(empty)
+        lines.append("")
+
+    lines += [
+        "## しきい値判定",
+        f"- 実行時間しきい値: {acceptance['execution_time_within_threshold']}",
+        f"- 新規失敗: {acceptance['no_new_failures']}",
+        f"- Flaky 許容: {acceptance['flaky_within_limit']}",
+        f"- カバレッジ低下: {acceptance['coverage_within_threshold']}",
+    ]
 
     report_path = output_dir / "regression-report.md"
-    report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _write_if_changed(report_path, "\n".join(lines) + "\n")
 
 
 def main() -> int:
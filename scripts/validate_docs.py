@@ -1,39 +1,59 @@
 #!/usr/bin/env python3
-import os
 import json
 import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+FILES_TO_CHECK = [
+    "README.md",
+    "docs/ENVIRONMENT_VARIABLES.md",
+    "docs/DEPLOYMENT.md",
+    "docs/sample-catalog.json",
+    "docs/QUICK_START.md",
+    "docs/FAQ.md",
+    "docs/ARCHITECTURE.md"
+]
+
+CONTENT_CHECKS = {
+    "README.md": ["Docker MCP Gateway Console"],
+    "docs/ENVIRONMENT_VARIABLES.md": ["BITWARDEN_CLI_PATH"],
+}
+
+JSON_CHECKS = {"docs/sample-catalog.json"}
 
 def check_file_exists(path):
-    if not os.path.exists(path):
+    if not path.exists():
         print(f"❌ Missing file: {path}")
         return False
     print(f"✅ Found file: {path}")
     return True
 
-def check_file_content(path, search_string):
+def check_file_content(path, search_strings):
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if search_string in content:
-                print(f"✅ Found '{search_string}' in {path}")
-                return True
-            else:
-                print(f"❌ Missing '{search_string}' in {path}")
-                return False
+        content = path.read_text(encoding='utf-8')
     except Exception as e:
         print(f"❌ Error reading {path}: {e}")
         return False
 
+    passed = True
+    for search_string in search_strings:
+        if search_string in content:
+            print(f"✅ Found '{search_string}' in {path}")
+        else:
+            print(f"❌ Missing '{search_string}' in {path}")
+            passed = False
+    return passed
+
 def validate_json(path):
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if "servers" in data and isinstance(data["servers"], list):
-                print(f"✅ Valid JSON structure in {path}")
-                return True
-            else:
-                print(f"❌ Invalid JSON structure in {path}: missing 'servers' list")
-                return False
+        data = json.loads(path.read_bytes())
+        if "servers" in data and isinstance(data["servers"], list):
+            print(f"✅ Valid JSON structure in {path}")
+            return True
+        else:
+            print(f"❌ Invalid JSON structure in {path}: missing 'servers' list")
+            return False
     except json.JSONDecodeError as e:
         print(f"❌ Invalid JSON in {path}: {e}")
         return False
@@ -42,36 +62,20 @@ def validate_json(path):
         return False
 
 def main():
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    
-    files_to_check = [
-        "README.md",
-        "docs/ENVIRONMENT_VARIABLES.md",
-        "docs/DEPLOYMENT.md",
-        "docs/sample-catalog.json",
-        "docs/QUICK_START.md",
-        "docs/FAQ.md",
-        "docs/ARCHITECTURE.md"
-    ]
-
     all_passed = True
 
     print("--- Checking Documentation Files ---")
-    for file_rel_path in files_to_check:
-        full_path = os.path.join(base_dir, file_rel_path)
+    for file_rel_path in FILES_TO_CHECK:
+        full_path = BASE_DIR / file_rel_path
         if not check_file_exists(full_path):
             all_passed = False
             continue
-        
-        if file_rel_path == "README.md":
-            if not check_file_content(full_path, "Docker MCP Gateway Console"):
-                all_passed = False
-        elif file_rel_path == "docs/ENVIRONMENT_VARIABLES.md":
-            if not check_file_content(full_path, "BITWARDEN_CLI_PATH"):
-                all_passed = False
-        elif file_rel_path == "docs/sample-catalog.json":
-            if not validate_json(full_path):
-                all_passed = False
+
+        search_strings = CONTENT_CHECKS.get(file_rel_path)
+        if search_strings and not check_file_content(full_path, search_strings):
+            all_passed = False
+        if file_rel_path in JSON_CHECKS and not validate_json(full_path):
+            all_passed = False
 
     if all_passed:
         print("\n✨ All documentation checks passed!")